@@ -1,13 +1,16 @@
 # app.py
+import html
 import math
-from datetime import datetime
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import streamlit as st
 
 from src.config import Config
 from src.database.paper_repository import PaperRepository
-from src.scheduler.scheduler_service import SchedulerService
+from src.model.paper import PaperPreview
 from src.queue import enqueue_summary_job, enqueue_comic_job
 
 
@@ -23,116 +26,257 @@ def get_repo() -> PaperRepository:
     return PaperRepository()
 
 
+# =====================================================
+# Cached queries (keyed by filters + data_version)
+# =====================================================
+# data_version 是 papers 表最新的 updated_at，任何写入（收藏 / 不喜欢 / 抓取）
+# 都会改变它，从而让下面的缓存失效；翻页等纯 UI 操作直接命中缓存。
+
+class _QueryCache:
+    """
+    进程内的查询结果缓存（LRU + TTL，线程安全）。
+
+    供查询线程池使用：工作线程里不调用 st.cache_data，也不依赖 Streamlit 的脚本上下文。
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+def _filters_key(filters: dict) -> tuple:
+    return tuple(sorted(filters.items()))
+
+
 @st.cache_resource
-def get_scheduler() -> SchedulerService:
+def _get_page_cache() -> _QueryCache:
+    return _QueryCache(ttl=60)
+
+
+@st.cache_resource
+def _get_count_cache() -> _QueryCache:
+    return _QueryCache(ttl=60)
+
+
+def _load_page(repo: PaperRepository, cache: _QueryCache, cursor, limit: int, data_version, **filters):
     """
-    Background scheduler (APScheduler).
+    Returns (papers, next_cursor).
 
-    This is started ONCE when Streamlit boots.
+    只做普通的仓库调用，可以直接在查询线程池中执行（预取下一页）。
     """
-    scheduler = SchedulerService()
-    scheduler.start()
-    return scheduler
+    key = (data_version, cursor, limit, _filters_key(filters))
+    page = cache.get(key)
+    if page is None:
+        page = repo.list_keyset(cursor=cursor, limit=limit, **filters)
+        cache.put(key, page)
+    return page
 
 
-# =====================================================
-# Helper functions (UI-level logic only)
-# =====================================================
+# 估计值低于该阈值时才做精确 COUNT(*)
+EXACT_COUNT_THRESHOLD = 10_000
 
-def _get_year(paper) -> int | None:
+
+def _count_papers(repo: PaperRepository, cache: _QueryCache, data_version, **filters) -> tuple[int, bool]:
     """
-    Try to extract year from paper.
+    Returns (total, is_estimate).
+
+    只做普通的仓库调用，可以直接在查询线程池中执行。
     """
-    dt = getattr(paper, "arxiv_published", None)
-    if isinstance(dt, datetime):
-        return dt.year
-    return None
+    key = (data_version, _filters_key(filters))
+    result = cache.get(key)
+    if result is None:
+        estimate = repo.count_estimate(**filters)
+        if estimate < EXACT_COUNT_THRESHOLD:
+            result = repo.count_with_filters(**filters), False
+        else:
+            result = estimate, True
+        cache.put(key, result)
+    return result
 
 
-def _get_authors(paper):
-    authors = getattr(paper, "authors", None)
-    if not authors:
-        return []
-    return list(authors)
+# 列表页 + 总数是两条独立的查询：缓存未命中时并发执行（各用一个连接池连接）
+@st.cache_resource
+def _get_query_pool() -> ThreadPoolExecutor:
+    # 脚本每次 rerun 都会重新执行模块代码，线程池需缓存为进程级单例
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="paper-query")
 
 
+def _load_page_and_count(repo: PaperRepository, cursor, limit: int, data_version, **filters):
+    """
+    Returns ((papers, next_cursor), (total, is_estimate)).
+    """
+    count_future = _get_query_pool().submit(
+        _count_papers, repo, _get_count_cache(), data_version, **filters
+    )
+    page = _load_page(repo, _get_page_cache(), cursor, limit, data_version, **filters)
+    return page, count_future.result()
+
+
+def _prefetch_page(repo: PaperRepository, cursor, limit: int, data_version, **filters) -> None:
+    """
+    后台预取下一页到 _load_page 的缓存中，不等待结果。
+
+    用户阅读当前页时查询已完成，点击「下一页」直接命中缓存。
+    """
+    if cursor is not None:
+        _get_query_pool().submit(
+            _load_page, repo, _get_page_cache(), cursor, limit, data_version, **filters
+        )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_folder_counts(data_version) -> dict[str, int]:
+    """
+    Sidebar folder counts (GROUP BY in Postgres).
+    """
+    return get_repo().get_folder_counts()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_filter_options(data_version, **filters) -> tuple[list[str], list[int]]:
+    """
+    Author / year options for the filter widgets (SELECT DISTINCT in Postgres).
+    """
+    repo = get_repo()
+    return repo.distinct_authors(**filters), repo.distinct_years(**filters)
+
+
+# =====================================================
+# Helper functions (UI-level logic only)
+# =====================================================
+
 def _trigger_favorite_auto_tasks(paper_id: str, repo: PaperRepository):
     """Trigger auto download PDF, summary, and comic when favoriting a paper (via RQ)."""
     from pathlib import Path
-    from src.service.pdf_download_service import PdfDownloader
+    from src.service.pdf_download_service import download_pdf_in_background
     from src.jobs.paper_summary_job import SummaryJobStatus
     from src.service.image_generation_service import comic_exists
 
     if Config.favorite.auto_download_pdf:
         pdf_path = Path(Config.pdf_save_path) / f"{paper_id}.pdf"
         if not pdf_path.exists():
-            try:
-                downloader = PdfDownloader()
-                downloader.download_one(f"https://arxiv.org/pdf/{paper_id}.pdf", paper_id)
-            except Exception:
-                pass  # Silent fail for quick action
+            download_pdf_in_background(paper_id)  # 不阻塞收藏操作
 
     if Config.favorite.auto_generate_summary:
-        paper = repo.get_paper_by_id(paper_id)
-        if paper and not paper.ai_summary:
+        if repo.is_field_missing(paper_id, "ai_summary"):
             repo.update_summary_job_status(paper_id, SummaryJobStatus.PENDING)
             enqueue_summary_job(paper_id)  # 使用 RQ 队列
 
     if Config.favorite.auto_generate_image:
         # 只在有内容（full_text/摘要/总结）时才生成漫画
-        paper = repo.get_paper_by_id(paper_id)
-        if paper and (paper.full_text or paper.ai_summary or paper.ai_abstract or paper.abstract):
+        if repo.has_any_field(paper_id, "full_text", "ai_summary", "ai_abstract", "abstract"):
             if not comic_exists(paper_id):
                 enqueue_comic_job(paper_id)  # 使用 RQ 队列
 
 
-def _go_prev_page():
-    """回调：上一页"""
-    if st.session_state.current_page > 1:
-        st.session_state.current_page -= 1
+def _caption_html(text: str) -> str:
+    """与 st.caption 样式一致的 HTML 片段（内容需已转义）"""
+    return f'<div style="opacity: 0.6; font-size: 0.875rem;">{text}</div>'
+
+
+def _render_card_static(p: PaperPreview) -> None:
+    """
+    Static part of a paper card.
 
+    标题 / AI 标题 / 摘要预览来自 arXiv 或 LLM，常含 LaTeX（$k<n$、$f'(x)$），
+    用普通 markdown 渲染（不开 unsafe_allow_html，也不做 HTML 转义，公式才能正常显示）；
+    只有收藏夹 + 元信息这类纯文本合并为一个转义过的 HTML 块。
+    """
+    # Title with status indicators
+    title_prefix = ""
+    if p.favorite_folders:
+        title_prefix += "⭐ "
+    if p.is_disliked:
+        title_prefix += "👎 "
+
+    st.markdown(f"### {title_prefix}📄 {p.title}")
+
+    if p.ai_title:
+        st.caption(f"🤖 AI Title: {p.ai_title}")
+
+    captions = []
+
+    # Show favorite folders if any
+    if p.favorite_folders:
+        folder_tags = " ".join(f"<code>{html.escape(f)}</code>" for f in p.favorite_folders)
+        captions.append(_caption_html(f"📁 {folder_tags}"))
+
+    meta = " · ".join(bit for bit in (p.year_display, p.authors_display) if bit)
+    if meta:
+        captions.append(_caption_html(html.escape(meta)))
+
+    if captions:
+        st.markdown("\n".join(captions), unsafe_allow_html=True)
 
-def _go_next_page(total_pages: int):
-    """回调：下一页"""
-    if st.session_state.current_page < total_pages:
-        st.session_state.current_page += 1
+    # PDF 直接用链接，不需要 st.link_button 组件
+    st.markdown(
+        f"{p.preview or '_(No abstract)_'}\n\n[📥 PDF](https://arxiv.org/pdf/{p.id}.pdf)"
+    )
+
+
+def _go_prev_page():
+    """回调：上一页（弹出当前页的起始游标）"""
+    if st.session_state.page_cursors:
+        st.session_state.page_cursors.pop()
 
 
-def _on_page_size_change():
-    """回调：每页数量变化时重置到第一页"""
-    st.session_state.current_page = 1
+def _go_next_page(next_cursor):
+    """回调：下一页（压入下一页的起始游标）"""
+    if next_cursor is not None:
+        st.session_state.page_cursors.append(next_cursor)
 
 
-def _render_pagination(total: int, position: str = "top") -> int:
+def _render_pagination(
+    total: int,
+    is_estimate: bool,
+    page_count: int,
+    next_cursor,
+    position: str = "top",
+) -> None:
     """
-    Render pagination controls with page size selector.
-    
+    Render keyset pagination controls with page size selector.
+
     Args:
         total: Total number of items
+        is_estimate: Whether total is a planner estimate
+        page_count: Number of items on the current page
+        next_cursor: Cursor of the next page, None on the last page
         position: 'top' or 'bottom' - used for unique keys
-    
-    Returns:
-        page_size: Selected page size
     """
-    # 获取当前值（使用 get 避免与 widget key 冲突）
     page_size = st.session_state.get("page_size", 10)
-    current_page = st.session_state.get("current_page", 1)
-    
+    current_page = len(st.session_state.page_cursors) + 1
     total_pages = max(1, math.ceil(total / page_size))
-    
-    # Reset page if out of bounds
-    if current_page > total_pages:
-        current_page = 1
-        st.session_state.current_page = 1
-    
-    # Layout: info | page_size | prev | page_select | next
-    col_info, col_size, col_prev, col_page_select, col_next = st.columns([2, 1.2, 1, 1.2, 1])
-    
+
+    # Layout: info | page_size | prev | page_info | next
+    col_info, col_size, col_prev, col_page_info, col_next = st.columns([2, 1.2, 1, 1.2, 1])
+
     with col_info:
         start = (current_page - 1) * page_size + 1
-        end = min(current_page * page_size, total)
-        st.caption(f"共 **{total}** 篇，显示 {start}-{end}")
-    
+        end = start + page_count - 1
+        total_label = f"~{total:,}" if is_estimate else f"{total}"
+        st.caption(f"共 **{total_label}** 篇，显示 {start}-{end}")
+
     with col_size:
         # 只在 top 位置渲染 selectbox，避免重复 key
         if position == "top":
@@ -144,13 +288,12 @@ def _render_pagination(total: int, position: str = "top") -> int:
                 index=default_index,
                 key="page_size",
                 format_func=lambda x: f"每页 {x} 篇",
-                on_change=_on_page_size_change,
                 label_visibility="collapsed",
             )
         else:
             # bottom 位置只显示文字
             st.caption(f"每页 {page_size} 篇")
-    
+
     with col_prev:
         st.button(
             "⬅ 上一页",
@@ -159,67 +302,87 @@ def _render_pagination(total: int, position: str = "top") -> int:
             width="stretch",
             on_click=_go_prev_page,
         )
-    
-    with col_page_select:
-        # 只在 top 位置渲染页码选择，避免重复 key
-        if position == "top":
-            page_options = list(range(1, total_pages + 1))
-            default_page_index = current_page - 1 if current_page <= total_pages else 0
-            st.selectbox(
-                "页码",
-                options=page_options,
-                index=default_page_index,
-                key="current_page",
-                label_visibility="collapsed",
-                format_func=lambda x: f"第 {x}/{total_pages} 页",
-            )
-        else:
-            st.caption(f"第 {current_page}/{total_pages} 页")
-    
+
+    with col_page_info:
+        st.caption(f"第 {current_page}/{'~' if is_estimate else ''}{total_pages} 页")
+
     with col_next:
         st.button(
             "下一页 ➡",
             key=f"next_{position}",
-            disabled=st.session_state.current_page >= total_pages,
+            disabled=next_cursor is None,
             width="stretch",
             on_click=_go_next_page,
-            args=(total_pages,),
+            args=(next_cursor,),
         )
-    
-    return st.session_state.page_size
-
 
-def _filter_papers(papers, search, author_filter, year_range):
-    search = (search or "").strip().lower()
-    y_min, y_max = year_range if year_range else (None, None)
 
-    filtered = []
-    for p in papers:
-        # Year filter
-        year = _get_year(p)
-        if year is not None and y_min is not None and y_max is not None:
-            if not (y_min <= year <= y_max):
-                continue
+@st.fragment
+def _render_paper_card(p: PaperPreview, all_folders: list[str]) -> None:
+    """
+    One paper card.
 
-        # Author filter
-        authors = _get_authors(p)
-        if author_filter:
-            if not any(a in author_filter for a in authors):
-                continue
+    作为 fragment 渲染：卡片内的控件交互（打开收藏夹 popover、输入新收藏夹名）
+    只重跑这张卡片；真正修改数据的操作调用 st.rerun() 刷新整页。
+    """
+    repo = get_repo()
 
-        # Text search
-        if search:
-            blob = " ".join([
-                p.title or "",
-                p.abstract or "",
-                " ".join(authors),
-            ]).lower()
-            if search not in blob:
-                continue
+    with st.container(border=True):
+        _render_card_static(p)
+
+        # Action buttons - 更紧凑的布局
+        c1, c2, c3 = st.columns([2, 1.5, 0.8])
+        with c1:
+            st.page_link(
+                "pages/1_Page_Detail.py",
+                label="详情",
+                icon="🔍",
+                query_params={"id": p.id},
+            )
+        with c2:
+            # 收藏夹快速操作
+            with st.popover("⭐", width="stretch"):
+                st.markdown("**添加到收藏夹**")
+                # 已有收藏夹
+                if all_folders:
+                    for folder in all_folders:
+                        is_in = folder in (p.favorite_folders or [])
+                        label = f"{'✓ ' if is_in else ''}{folder}"
+                        if st.button(
+                            label,
+                            key=f"toggle_fav_{p.id}_{folder}",
+                            width="stretch",
+                        ):
+                            if is_in:
+                                repo.remove_from_folder(p.id, folder)
+                            else:
+                                repo.add_to_folder(p.id, folder)
+                                _trigger_favorite_auto_tasks(p.id, repo)
+                            st.rerun()
 
-        filtered.append(p)
+                # 新建收藏夹
+                st.markdown("---")
+                new_folder = st.text_input(
+                    "新建",
+                    key=f"new_fav_{p.id}",
+                    placeholder="收藏夹名称",
+                    label_visibility="collapsed",
+                )
+                if new_folder and st.button("➕ 创建", key=f"create_fav_{p.id}"):
+                    repo.add_to_folder(p.id, new_folder.strip())
+                    _trigger_favorite_auto_tasks(p.id, repo)
+                    st.rerun()
 
-    return filtered
+        with c3:
+            # 不喜欢按钮 - 更小
+            if p.is_disliked:
+                if st.button("↩", key=f"undislike_{p.id}", help="取消不喜欢"):
+                    repo.unmark_disliked(p.id)
+                    st.rerun()
+            else:
+                if st.button("👎", key=f"dislike_{p.id}", help="不喜欢"):
+                    repo.mark_disliked(p.id)
+                    st.rerun()
 
 
 # =====================================================
@@ -236,14 +399,14 @@ def main():
 
     # --- init services ---
     repo = get_repo()
-    scheduler = get_scheduler()  # noqa: F841 (intentional side effect)
+    data_version = repo.get_data_version()
 
     # --- Sidebar: Folder filter & Settings ---
     with st.sidebar:
         st.markdown("### 📁 收藏夹")
 
         # Get all folders with counts
-        folder_counts = repo.get_folder_counts()
+        folder_counts = _load_folder_counts(data_version)
         all_folders = sorted(folder_counts.keys())
 
         # 初始化 folder filter state
@@ -333,11 +496,7 @@ def main():
         st.divider()
 
     # --- load papers from Postgres ---
-    papers = repo.list_with_filters(
-        page=1,
-        page_size=10_000,  # UI-level fetch
-        sort_by="created_at",
-        order="desc",
+    base_filters = dict(
         include_favorite=show_favorite,
         include_disliked=show_disliked,
         folder_filter=folder_filter,
@@ -353,7 +512,7 @@ def main():
     if filter_info:
         st.info(" | ".join(filter_info))
 
-    if not papers:
+    if _count_papers(repo, _get_count_cache(), data_version, **base_filters)[0] == 0:
         if folder_filter:
             st.info(f"收藏夹「{folder_filter}」中暂无论文。")
         else:
@@ -370,9 +529,7 @@ def main():
                 placeholder="例如：vector database, RAG, transformer...",
             )
 
-        all_authors = sorted(
-            {a for p in papers for a in _get_authors(p)}
-        )
+        all_authors, all_years = _load_filter_options(data_version, **base_filters)
 
         with col_author:
             author_filter = st.multiselect(
@@ -381,10 +538,6 @@ def main():
                 default=[],
             )
 
-        all_years = sorted(
-            {y for p in papers if (y := _get_year(p)) is not None}
-        )
-
         if len(all_years) > 1:
             # 多个年份时显示滑块
             with col_year:
@@ -405,124 +558,55 @@ def main():
 
     st.divider()
 
-    # ---------- 过滤 ----------
-    filtered = _filter_papers(papers, search, author_filter, year_range)
+    # ---------- 分页（keyset 游标） ----------
+    page_size = st.session_state.get("page_size", 10)
+    list_filters = dict(
+        **base_filters,
+        search=search,
+        authors=tuple(author_filter),
+        year_range=year_range,
+    )
+
+    # 筛选条件或每页数量变化时回到第一页
+    page_key = (tuple(sorted(list_filters.items())), page_size)
+    if st.session_state.get("page_key") != page_key:
+        st.session_state.page_key = page_key
+        st.session_state.page_cursors = []
+
+    cursors = st.session_state.page_cursors
+    (page_papers, next_cursor), (total, is_estimate) = _load_page_and_count(
+        repo,
+        cursors[-1] if cursors else None,
+        page_size,
+        data_version,
+        **list_filters,
+    )
+
+    # 游标已失效（例如最后一页的论文都被标记了不喜欢），回到第一页
+    if not page_papers and cursors:
+        st.session_state.page_cursors = []
+        st.rerun()
 
-    total = len(filtered)
-    if total == 0:
+    # 第一页为空即没有结果；total 可能是规划器估计值（永远不会估成 0），不能只看它
+    if not page_papers or total == 0:
         st.warning("没有符合条件的论文。")
         st.stop()
 
     # ---------- 分页控件（卡片上方） ----------
-    page_size = _render_pagination(total, position="top")
-
-    start_idx = (st.session_state.current_page - 1) * page_size
-    end_idx = start_idx + page_size
-    page_papers = filtered[start_idx:end_idx]
+    _render_pagination(total, is_estimate, len(page_papers), next_cursor, position="top")
 
     # ---------- 卡片列表 ----------
     cols = st.columns(2)
 
     for i, p in enumerate(page_papers):
         with cols[i % 2]:
-            with st.container(border=True):
-                # Title with status indicators
-                title_prefix = ""
-                if p.favorite_folders:
-                    title_prefix += "⭐ "
-                if p.is_disliked:
-                    title_prefix += "👎 "
-
-                st.markdown(f"### {title_prefix}📄 {p.title}")
-
-                if p.ai_title:
-                    st.caption(f"🤖 AI Title: {p.ai_title}")
-
-                # Show favorite folders if any
-                if p.favorite_folders:
-                    folder_tags = " ".join([f"`{f}`" for f in p.favorite_folders])
-                    st.caption(f"📁 {folder_tags}")
-
-                meta_bits = []
-                year = _get_year(p)
-                if year:
-                    meta_bits.append(str(year))
-
-                authors = _get_authors(p)
-                if authors:
-                    meta_bits.append(
-                        ", ".join(authors[:3]) + (" ..." if len(authors) > 3 else "")
-                    )
-
-                if meta_bits:
-                    st.caption(" · ".join(meta_bits))
-
-                preview = p.ai_abstract or p.abstract or ""
-                st.write(preview or "_(No abstract)_")
-
-                # Action buttons - 更紧凑的布局
-                c1, c2, c3, c4 = st.columns([2, 1.5, 1.5, 0.8])
-                with c1:
-                    st.page_link(
-                        "pages/1_Page_Detail.py",
-                        label="详情",
-                        icon="🔍",
-                        query_params={"id": p.id},
-                    )
-                with c2:
-                    st.link_button(
-                        "PDF",
-                        f"https://arxiv.org/pdf/{p.id}.pdf",
-                        width="stretch",
-                    )
-                with c3:
-                    # 收藏夹快速操作
-                    with st.popover("⭐", width="stretch"):
-                        st.markdown("**添加到收藏夹**")
-                        # 已有收藏夹
-                        if all_folders:
-                            for folder in all_folders:
-                                is_in = folder in (p.favorite_folders or [])
-                                label = f"{'✓ ' if is_in else ''}{folder}"
-                                if st.button(
-                                    label,
-                                    key=f"toggle_fav_{p.id}_{folder}",
-                                    width="stretch",
-                                ):
-                                    if is_in:
-                                        repo.remove_from_folder(p.id, folder)
-                                    else:
-                                        repo.add_to_folder(p.id, folder)
-                                        _trigger_favorite_auto_tasks(p.id, repo)
-                                    st.rerun()
-
-                        # 新建收藏夹
-                        st.markdown("---")
-                        new_folder = st.text_input(
-                            "新建",
-                            key=f"new_fav_{p.id}",
-                            placeholder="收藏夹名称",
-                            label_visibility="collapsed",
-                        )
-                        if new_folder and st.button("➕ 创建", key=f"create_fav_{p.id}"):
-                            repo.add_to_folder(p.id, new_folder.strip())
-                            _trigger_favorite_auto_tasks(p.id, repo)
-                            st.rerun()
-
-                with c4:
-                    # 不喜欢按钮 - 更小
-                    if p.is_disliked:
-                        if st.button("↩", key=f"undislike_{p.id}", help="取消不喜欢"):
-                            repo.unmark_disliked(p.id)
-                            st.rerun()
-                    else:
-                        if st.button("👎", key=f"dislike_{p.id}", help="不喜欢"):
-                            repo.mark_disliked(p.id)
-                            st.rerun()
+            _render_paper_card(p, all_folders)
 
     # ---------- 分页控件（卡片下方） ----------
     st.divider()
-    _render_pagination(total, position="bottom")
+    _render_pagination(total, is_estimate, len(page_papers), next_cursor, position="bottom")
+
+    _prefetch_page(repo, next_cursor, page_size, data_version, **list_filters)
 
 
 if __name__ == "__main__":
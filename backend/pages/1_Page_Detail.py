@@ -3,7 +3,6 @@ from datetime import datetime
 from pathlib import Path
 
 from src.database.paper_repository import PaperRepository
-from src.scheduler.scheduler_service import SchedulerService
 from src.service.llm_service import (
     init_litellm,
     translate_summary,
@@ -12,7 +11,7 @@ from src.service.llm_service import (
 from src.service.chat_service import ChatService, _convert_latex_format
 from src.database.chat_repository import ChatRepository
 from src.service.pdf_parser_service import extract_pdf_markdown
-from src.service.pdf_download_service import PdfDownloader
+from src.service.pdf_download_service import download_pdf_in_background, is_pdf_downloading
 from src.jobs.paper_summary_job import SummaryJobStatus
 from src.jobs.paper_comic_job import ComicJobStatus
 from src.config import Config
@@ -35,14 +34,6 @@ def get_repo() -> PaperRepository:
     return PaperRepository()
 
 
-@st.cache_resource
-def get_scheduler() -> SchedulerService:
-    """Get the shared scheduler instance."""
-    scheduler = SchedulerService()
-    scheduler.start()
-    return scheduler
-
-
 @st.cache_resource
 def setup_llm():
     init_litellm()
@@ -58,10 +49,8 @@ def get_chat_service() -> ChatService:
 # Helper: Favorite & Dislike UI
 # ======================================================
 
-def _render_favorite_dislike_section(paper, repo: PaperRepository, scheduler: SchedulerService):
+def _render_favorite_dislike_section(paper, repo: PaperRepository):
     """Render the favorite folders and dislike section."""
-    from src.model.paper import Paper
-
     col_fav, col_dislike = st.columns([3, 1])
 
     with col_fav:
@@ -122,6 +111,17 @@ def _render_favorite_dislike_section(paper, repo: PaperRepository, scheduler: Sc
                 st.rerun()
 
 
+# 聊天框中直接渲染的最近消息条数
+CHAT_VISIBLE_MESSAGES = 20
+
+
+def _render_chat_messages(messages):
+    for msg in messages:
+        with st.chat_message(msg.role):
+            # 转换 LaTeX 格式以正确渲染公式
+            st.markdown(_convert_latex_format(msg.content))
+
+
 def _render_chat_section(paper, repo: PaperRepository):
     """Render the chat section with session management."""
     chat_service = get_chat_service()
@@ -199,13 +199,17 @@ def _render_chat_section(paper, repo: PaperRepository):
         
         with chat_container:
             # 显示消息（跳过 system 消息）
-            for msg in current_session.messages:
-                if msg.role == "system":
-                    continue  # 不显示 system prompt
-                
-                with st.chat_message(msg.role):
-                    # 转换 LaTeX 格式以正确渲染公式
-                    st.markdown(_convert_latex_format(msg.content))
+            messages = [msg for msg in current_session.messages if msg.role != "system"]
+
+            # 只渲染最近的消息；更早的历史在打开开关后才渲染
+            # （st.expander 收起时内容仍会发送到前端，所以这里用 toggle）
+            hidden = messages[:-CHAT_VISIBLE_MESSAGES]
+            if hidden and st.toggle(
+                f"显示更早的 {len(hidden)} 条消息",
+                key=f"show_older_{current_session.id}",
+            ):
+                _render_chat_messages(hidden)
+            _render_chat_messages(messages[-CHAT_VISIBLE_MESSAGES:])
         
         # 输入框 - 使用 session_state 保存输入
         if "pending_chat_input" not in st.session_state:
@@ -224,7 +228,7 @@ def _render_chat_section(paper, repo: PaperRepository):
                     response_placeholder = st.empty()
                     full_response = ""
                     
-                    for chunk in chat_service.ask_stream(current_session.id, user_input):
+                    for chunk in chat_service.ask_stream(current_session.id, user_input, session=current_session):
                         full_response += chunk
                         # 实时更新 markdown 渲染（转换 LaTeX 格式）
                         response_placeholder.markdown(_convert_latex_format(full_response) + "▌")
@@ -232,8 +236,9 @@ def _render_chat_section(paper, repo: PaperRepository):
                     # 移除光标，显示最终结果
                     response_placeholder.markdown(_convert_latex_format(full_response))
             
-            # 刷新以更新会话列表（标题可能已更新）
-            st.rerun()
+            # 回复已在上方渲染完毕；只有首个问题会生成会话标题，此时才需要刷新会话列表
+            if current_session.title is None:
+                st.rerun()
         
         # 删除会话按钮
         st.markdown("---")
@@ -250,8 +255,6 @@ def _render_chat_section(paper, repo: PaperRepository):
 
 def _add_paper_to_folder(paper_id: str, folder_name: str, repo: PaperRepository):
     """Add paper to folder and trigger auto tasks if configured (via RQ)."""
-    from pathlib import Path
-
     added = repo.add_to_folder(paper_id, folder_name)
 
     if added:
@@ -261,28 +264,17 @@ def _add_paper_to_folder(paper_id: str, folder_name: str, repo: PaperRepository)
         if Config.favorite.auto_download_pdf:
             pdf_path = Path(Config.pdf_save_path) / f"{paper_id}.pdf"
             if not pdf_path.exists():
+                download_pdf_in_background(paper_id)
                 st.info("📥 正在后台下载 PDF...")
-                # Download PDF in background (or inline for simplicity)
-                downloader = PdfDownloader()
-                try:
-                    downloader.download_one(
-                        f"https://arxiv.org/pdf/{paper_id}.pdf",
-                        paper_id,
-                    )
-                    st.success("✅ PDF 下载完成")
-                except Exception as e:
-                    st.warning(f"⚠️ PDF 下载失败: {e}")
 
         if Config.favorite.auto_generate_summary:
-            paper = repo.get_paper_by_id(paper_id)
-            if paper and not paper.ai_summary:
+            if repo.is_field_missing(paper_id, "ai_summary"):
                 repo.update_summary_job_status(paper_id, SummaryJobStatus.PENDING)
                 enqueue_summary_job(paper_id)  # 使用 RQ 队列
                 st.info("🧠 已提交 AI 总结任务到 RQ 队列")
 
         if Config.favorite.auto_generate_image:
-            paper = repo.get_paper_by_id(paper_id)
-            if paper and (paper.full_text or paper.ai_summary or paper.ai_abstract or paper.abstract):
+            if repo.has_any_field(paper_id, "full_text", "ai_summary", "ai_abstract", "abstract"):
                 if not comic_exists(paper_id):
                     enqueue_comic_job(paper_id)  # 使用 RQ 队列
                     st.info("🎨 已提交漫画生成任务到 RQ 队列")
@@ -302,7 +294,6 @@ def main():
 
     setup_llm()
     repo = get_repo()
-    scheduler = get_scheduler()
 
     # ---------- Params ----------
     params = st.query_params
@@ -322,7 +313,7 @@ def main():
     st.caption(f"ArXiv ID: `{paper.id}`")
 
     # ---------------- Favorite & Dislike Actions ----------------
-    _render_favorite_dislike_section(paper, repo, scheduler)
+    _render_favorite_dislike_section(paper, repo)
 
     st.divider()
 
@@ -556,15 +547,16 @@ def main():
         # ---------- Tab: 本地 PDF ----------
         with tab_pdf:
             if not pdf_path.exists():
-                st.warning("⚠ 当前 PDF 尚未下载")
-                if st.button("📥 立即下载 PDF", key="download_pdf_tab"):
-                    downloader = PdfDownloader()
-                    downloader.download_one(
-                        f"https://arxiv.org/pdf/{paper.id}.pdf",
-                        paper.id,
-                    )
-                    st.success("已下载 PDF")
-                    st.rerun()
+                if is_pdf_downloading(paper.id):
+                    st.info("⏳ PDF 正在后台下载，完成后刷新即可查看")
+                    if st.button("🔄 刷新", key="refresh_pdf_tab"):
+                        st.rerun()
+                else:
+                    st.warning("⚠ 当前 PDF 尚未下载")
+                    if st.button("📥 立即下载 PDF", key="download_pdf_tab"):
+                        # 后台线程下载，页面不必等待整个文件传完
+                        download_pdf_in_background(paper.id)
+                        st.rerun()
             else:
                 with st.spinner("⏳ 正在加载 PDF..."):
                     pdf_viewer(pdf_path, width=900, height=2000)
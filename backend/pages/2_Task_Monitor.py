@@ -14,7 +14,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from src.scheduler.scheduler_service import SchedulerService
+from apscheduler.triggers.cron import CronTrigger
+
+from src.config import Config
 from src.queue import (
     # Summary queue
     get_queue_stats,
@@ -30,21 +32,11 @@ from src.queue import (
     get_comic_started_jobs,
     get_comic_recent_finished_jobs,
     get_comic_failed_jobs,
+    # Default queue
+    enqueue_daily_arxiv_job,
 )
 
 
-# ======================================================
-# Cached singletons
-# ======================================================
-
-@st.cache_resource
-def get_scheduler() -> SchedulerService:
-    """Get the shared scheduler instance."""
-    scheduler = SchedulerService()
-    scheduler.start()
-    return scheduler
-
-
 # ======================================================
 # Helper functions
 # ======================================================
@@ -56,6 +48,12 @@ def _format_datetime(dt: Optional[datetime]) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _next_cron_run(cron_expr: str) -> Optional[datetime]:
+    """Next fire time of a crontab expression in the scheduler timezone."""
+    trigger = CronTrigger.from_crontab(cron_expr, timezone=Config.scheduler.timezone)
+    return trigger.get_next_fire_time(None, datetime.now(trigger.timezone))
+
+
 def _read_log_file(log_path: Path, tail_lines: int = 100) -> str:
     """Read last N lines of a log file."""
     if not log_path.exists():
@@ -141,33 +139,32 @@ def main():
     # 2. 定时任务（APScheduler）
     # ========================================
     st.subheader("⏰ 定时任务（APScheduler）")
+    st.caption("调度器作为独立进程运行（supervisord: scheduler），这里展示配置的任务")
     
-    scheduler = get_scheduler()
-    jobs = scheduler.scheduler.get_jobs()
+    scheduled_jobs = [
+        ("daily_arxiv", Config.scheduler.daily_arxiv_job, enqueue_daily_arxiv_job),
+    ]
     
-    if not jobs:
-        st.info("暂无定时任务")
-    else:
-        for job in jobs:
-            with st.container(border=True):
-                col_info, col_action = st.columns([4, 1])
-                
-                with col_info:
-                    st.markdown(f"**{job.id}**")
-                    st.caption(f"下次执行: {_format_datetime(job.next_run_time)}")
-                    
-                    # 显示触发器信息
-                    trigger_str = str(job.trigger)
-                    st.caption(f"触发器: `{trigger_str}`")
-                
-                with col_action:
-                    if st.button("▶️ 立即执行", key=f"run_{job.id}", width="stretch"):
-                        try:
-                            job.func()
-                            st.success("任务已触发")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"执行失败: {e}")
+    if not Config.scheduler.enabled:
+        st.info("定时任务已在配置中禁用")
+    
+    for job_id, cron_expr, enqueue in scheduled_jobs:
+        with st.container(border=True):
+            col_info, col_action = st.columns([4, 1])
+            
+            with col_info:
+                st.markdown(f"**{job_id}**")
+                if Config.scheduler.enabled:
+                    st.caption(f"下次执行: {_format_datetime(_next_cron_run(cron_expr))}")
+                st.caption(f"触发器: `cron[{cron_expr}]`")
+            
+            with col_action:
+                if st.button("▶️ 立即执行", key=f"run_{job_id}", width="stretch"):
+                    try:
+                        enqueue()  # 交给 RQ Worker 执行，不阻塞页面
+                        st.success("任务已提交到队列")
+                    except Exception as e:
+                        st.error(f"提交失败: {e}")
     
     st.divider()
     
@@ -324,8 +321,8 @@ def main():
     
     log_dir = Path(__file__).parent.parent / "logs"
     
-    log_tab1, log_tab2, log_tab3 = st.tabs([
-        "🔵 RQ Worker (Stdout)", "🔴 RQ Worker (Error)", "⚙️ Supervisor"
+    log_tab1, log_tab2, log_tab3, log_tab4 = st.tabs([
+        "🔵 RQ Worker (Stdout)", "🔴 RQ Worker (Error)", "⏰ Scheduler", "⚙️ Supervisor"
     ])
     
     # 日志行数选择
@@ -344,6 +341,11 @@ def main():
         st.code(log_content, language="log", line_numbers=True)
     
     with log_tab3:
+        log_path = log_dir / "scheduler.log"
+        log_content = _read_log_file(log_path, tail_lines)
+        st.code(log_content, language="log", line_numbers=True)
+    
+    with log_tab4:
         log_path = log_dir / "supervisord.log"
         log_content = _read_log_file(log_path, tail_lines)
         st.code(log_content, language="log", line_numbers=True)
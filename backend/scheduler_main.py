@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# scheduler_main.py
+
+"""
+APScheduler 定时任务进程（独立于 Streamlit）
+
+使用方式:
+    python scheduler_main.py
+
+一般由 supervisord 管理（program:scheduler），
+Streamlit 只负责展示数据，不再在 UI 进程中启动调度器。
+"""
+
+import sys
+import signal
+import threading
+
+# 确保可以导入 src 模块
+sys.path.insert(0, '.')
+
+from src.config import Config
+from src.scheduler.scheduler_service import SchedulerService
+
+
+def main():
+    """启动 Scheduler 并阻塞，直到收到退出信号"""
+    stop_event = threading.Event()
+
+    def _handle_signal(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+
+    scheduler = SchedulerService()
+
+    if Config.scheduler.enabled:
+        scheduler.start()
+    else:
+        # 禁用时保持空闲而不是立即退出：supervisord 的 startsecs 内退出会被判为启动失败（FATAL）
+        print("⏸ Scheduler disabled by config, idling")
+
+    try:
+        stop_event.wait()
+    finally:
+        scheduler.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,66 +1,107 @@
+import re
+import threading
+import time
 import arxiv
+from concurrent.futures import ThreadPoolExecutor
+from ..config import Config
 from ..model.paper import Paper
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
+# arXiv 版本后缀，例如 2401.01234v2 -> 2401.01234
+_VERSION_RE = re.compile(r"v\d+")
+
+# arXiv API 单页最多返回的条数
+_MAX_PAGE_SIZE = 2000
+
+
 class ArxivClient:
-    def __init__(self):
-        self.arxiv_client = arxiv.Client(
-            page_size=100,
-            delay_seconds=1,
-            num_retries=3,
-        )
+    def __init__(self, max_concurrency: Optional[int] = None):
+        # 同时进行的关键词查询数上限
+        self.max_concurrency = max_concurrency or Config.arxiv.max_concurrency
+        # 所有线程合计的请求发起间隔（arxiv.Client 自带的限速不是线程安全的）
+        self.delay_seconds = Config.arxiv.delay_seconds
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def _wait_for_request_slot(self) -> None:
+        """按 delay_seconds 排队：保证任意两次查询的发起间隔不小于 delay_seconds"""
+        with self._throttle_lock:
+            wait = self._next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request_at = time.monotonic() + self.delay_seconds
 
     def search_papers(self, keywords: List[str], max_results: int = 100, sort_by: arxiv.SortCriterion = arxiv.SortCriterion.SubmittedDate) -> Dict[str, List[Paper]]:
         """
         搜索论文，默认按提交时间排序，确保获取到最新的论文。
         """
-        keywords_papers: Dict[str, List[Paper]] = {}
-        for keyword in keywords:
+        # 同一批次共用一个抓取时间戳，不必每篇论文各格式化两次
+        fetched_at = datetime.utcnow().isoformat()
+
+        def _search_one(keyword: str) -> List[Paper]:
             # 如果关键词包含空格且没有引号，则包裹引号以进行精确匹配
             query = keyword
             if " " in keyword and not (keyword.startswith('"') and keyword.endswith('"')):
                 query = f'"{keyword}"'
             
-            keywords_papers[keyword] = []
             search_query = arxiv.Search(
                 query=query,
                 max_results=max_results,
                 sort_by=sort_by,   
                 sort_order=arxiv.SortOrder.Descending,
             )
-            results = self.arxiv_client.results(search_query)
-            keywords_papers[keyword].extend([self._arxiv_result_to_paper(result, keyword) for result in results])
-        return keywords_papers
+            # 每个查询用独立的 arxiv.Client（其内部状态不跨线程共享），
+            # 单页取完 max_results，一次查询只发一次请求
+            client = arxiv.Client(
+                page_size=min(max_results, _MAX_PAGE_SIZE),
+                delay_seconds=self.delay_seconds,
+                num_retries=3,
+            )
+            self._wait_for_request_slot()
+            results = list(client.results(search_query))
+            return [self._arxiv_result_to_paper(result, keyword, fetched_at) for result in results]
+
+        # 各关键词的查询是独立的网络请求，并发执行；结果仍按关键词原顺序返回
+        workers = max(1, min(self.max_concurrency, len(keywords)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(keywords, pool.map(_search_one, keywords)))
     
     def _normalize_arxiv_id(self, arxiv_id: str) -> str:
-        import re
-        last = arxiv_id.split("/")[-1]
+        last = arxiv_id.rpartition("/")[2]
 
-        return re.sub(r"v\d+", "", last)
+        return _VERSION_RE.sub("", last)
     
-    def _get_pdf_url(self, result: arxiv.Result) -> str:
-        for link in result.links:
-            if "pdf" in link.href.lower():
-                return link.href
+    def _get_pdf_url(self, hrefs: List[str]) -> str:
+        for href in hrefs:
+            if "pdf" in href.lower():
+                return href
         return ""
     
-    def _arxiv_result_to_paper(self, result: arxiv.Result, keyword: str) -> Paper:
+    def _arxiv_result_to_paper(
+        self,
+        result: arxiv.Result,
+        keyword: str,
+        fetched_at: Optional[str] = None,
+    ) -> Paper:
+        fetched_at = fetched_at or datetime.utcnow().isoformat()
+        authors = [author.name for author in result.authors]
+        links = [link.href for link in result.links]
         return Paper(
             id=self._normalize_arxiv_id(result.entry_id),
             title=result.title,
             abstract=result.summary,
-            authors=[author.name for author in result.authors],
-            pdf_url=self._get_pdf_url(result),
+            authors=authors,
+            pdf_url=self._get_pdf_url(links),
             keywords=[keyword],
-            created_at=str(datetime.utcnow().isoformat()),
-            updated_at=str(datetime.utcnow().isoformat()),
+            created_at=fetched_at,
+            updated_at=fetched_at,
             arxiv_entry_id=result.entry_id,
             arxiv_updated=result.updated,
             arxiv_published=result.published,
-            arxiv_authors=[author.name for author in result.authors],
-            arxiv_links=[link.href for link in result.links],
+            arxiv_authors=list(authors),
+            arxiv_links=links,
             arxiv_comment=result.comment,
             arxiv_journal_ref=result.journal_ref,
             arxiv_doi=result.doi,
@@ -11,15 +11,29 @@ Chat Repository - 管理聊天会话和消息
 
 from __future__ import annotations
 
-import uuid
 from typing import List, Optional
 from datetime import datetime
 
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, delete, update, bindparam, func
+from sqlalchemy.orm import selectinload
 
-from src.model.chat import ChatSession, ChatMessage
+from src.model.chat import ChatSession, ChatMessage, uuid7
 from src.database.db.session import SessionLocal
-from src.database.db.models import ChatSessionRow, ChatMessageRow
+from src.database.db.models import ChatSessionRow, ChatMessageRow, SQL_UTC_NOW
+
+
+# 热路径语句：模块级构建一次，带 bindparam 重复执行
+_SELECT_MESSAGES = (
+    select(ChatMessageRow)
+    .where(ChatMessageRow.session_id == bindparam("session_id"))
+    .order_by(ChatMessageRow.created_at)
+)
+
+_SELECT_SESSIONS_BY_PAPER = (
+    select(ChatSessionRow)
+    .where(ChatSessionRow.paper_id == bindparam("paper_id"))
+    .order_by(desc(ChatSessionRow.updated_at))
+)
 
 
 class ChatRepository:
@@ -46,7 +60,7 @@ class ChatRepository:
         Returns:
             新创建的会话
         """
-        session_id = str(uuid.uuid4())
+        session_id = str(uuid7())
         now = datetime.utcnow()
         
         with SessionLocal() as db:
@@ -68,16 +82,37 @@ class ChatRepository:
                 created_at=now,
             )
             db.add(system_msg)
+            db.flush()  # INSERT ... RETURNING 拿到 system 消息 id
             
+            # 直接用已知的值构造返回对象，避免 commit 后 refresh + 懒加载 messages
+            session = ChatSession(
+                id=session_id,
+                paper_id=paper_id,
+                title=title,
+                created_at=now,
+                updated_at=now,
+                messages=[
+                    ChatMessage(
+                        id=system_msg.id,
+                        session_id=session_id,
+                        role="system",
+                        content=system_prompt,
+                        created_at=now,
+                    )
+                ],
+            )
             db.commit()
-            db.refresh(session_row)
             
-            return self._row_to_session(session_row)
+            return session
 
     def get_session(self, session_id: str) -> Optional[ChatSession]:
         """获取会话（包含所有消息）"""
         with SessionLocal() as db:
-            row = db.get(ChatSessionRow, session_id)
+            row = db.get(
+                ChatSessionRow,
+                session_id,
+                options=[selectinload(ChatSessionRow.messages)],
+            )
             if not row:
                 return None
             return self._row_to_session(row)
@@ -86,33 +121,24 @@ class ChatRepository:
         """获取论文的所有会话（不包含消息内容，用于列表显示）"""
         with SessionLocal() as db:
             rows = db.execute(
-                select(ChatSessionRow)
-                .where(ChatSessionRow.paper_id == paper_id)
-                .order_by(desc(ChatSessionRow.updated_at))
+                _SELECT_SESSIONS_BY_PAPER, {"paper_id": paper_id}
             ).scalars().all()
             
             return [self._row_to_session(row, include_messages=False) for row in rows]
 
     def delete_session(self, session_id: str) -> bool:
-        """删除会话（级联删除所有消息）"""
+        """删除会话（消息由外键 ON DELETE CASCADE 级联删除）"""
         with SessionLocal() as db:
-            row = db.get(ChatSessionRow, session_id)
-            if not row:
-                return False
-            
-            db.delete(row)
+            result = db.execute(
+                delete(ChatSessionRow).where(ChatSessionRow.id == session_id)
+            )
             db.commit()
-            return True
+            return result.rowcount > 0
 
     def update_session_title(self, session_id: str, title: str) -> None:
         """更新会话标题"""
         with SessionLocal() as db:
-            row = db.get(ChatSessionRow, session_id)
-            if not row:
-                return
-            
-            row.title = title
-            row.updated_at = datetime.utcnow()
+            self._touch_session(db, session_id, title=title)
             db.commit()
 
     # =====================================================
@@ -136,14 +162,14 @@ class ChatRepository:
         Returns:
             新添加的消息，如果会话不存在返回 None
         """
+        now = datetime.utcnow()
+
         with SessionLocal() as db:
-            # 检查会话是否存在
-            session_row = db.get(ChatSessionRow, session_id)
-            if not session_row:
+            # 更新会话时间，同时检查会话是否存在
+            if not self._touch_session(db, session_id, now=now):
                 return None
             
             # 添加消息
-            now = datetime.utcnow()
             msg_row = ChatMessageRow(
                 session_id=session_id,
                 role=role,
@@ -151,28 +177,64 @@ class ChatRepository:
                 created_at=now,
             )
             db.add(msg_row)
+            db.flush()  # INSERT ... RETURNING id
             
-            # 更新会话时间
-            session_row.updated_at = now
-            
-            db.commit()
-            db.refresh(msg_row)
-            
-            return ChatMessage(
+            message = ChatMessage(
                 id=msg_row.id,
-                session_id=msg_row.session_id,
-                role=msg_row.role,
-                content=msg_row.content,
-                created_at=msg_row.created_at,
+                session_id=session_id,
+                role=role,
+                content=content,
+                created_at=now,
             )
+            db.commit()
+            
+            return message
+
+    def add_messages(
+        self,
+        session_id: str,
+        messages: List[ChatMessage],
+    ) -> List[ChatMessage]:
+        """
+        批量添加消息（一次事务、一条多行 INSERT）
+
+        每条消息保留自身的 created_at，保证同一轮问答的先后顺序。
+
+        Returns:
+            写入后的消息（带 id），如果会话不存在返回空列表
+        """
+        if not messages:
+            return []
+
+        with SessionLocal() as db:
+            if not self._touch_session(db, session_id, now=messages[-1].created_at):
+                return []
+
+            rows = [
+                ChatMessageRow(
+                    session_id=session_id,
+                    role=msg.role,
+                    content=msg.content,
+                    created_at=msg.created_at,
+                )
+                for msg in messages
+            ]
+            db.add_all(rows)
+            db.flush()  # INSERT ... VALUES (...), (...) RETURNING id
+
+            saved = [
+                msg.model_copy(update={"id": row.id, "session_id": session_id})
+                for msg, row in zip(messages, rows)
+            ]
+            db.commit()
+
+            return saved
 
     def get_messages(self, session_id: str) -> List[ChatMessage]:
         """获取会话的所有消息"""
         with SessionLocal() as db:
             rows = db.execute(
-                select(ChatMessageRow)
-                .where(ChatMessageRow.session_id == session_id)
-                .order_by(ChatMessageRow.created_at)
+                _SELECT_MESSAGES, {"session_id": session_id}
             ).scalars().all()
             
             return [
@@ -216,11 +278,8 @@ class ChatRepository:
                 title += "..."
             
             # 更新标题
-            session_row = db.get(ChatSessionRow, session_id)
-            if session_row:
-                session_row.title = title
-                session_row.updated_at = datetime.utcnow()
-                db.commit()
+            self._touch_session(db, session_id, title=title)
+            db.commit()
             
             return title
 
@@ -228,6 +287,29 @@ class ChatRepository:
     # Helper Methods
     # =====================================================
 
+    def _touch_session(
+        self,
+        db,
+        session_id: str,
+        now: Optional[datetime] = None,
+        **values,
+    ) -> bool:
+        """
+        单条 UPDATE 更新会话（updated_at 及可选字段），不先 SELECT 整行
+
+        未传入 now 时 updated_at 由数据库生成
+
+        Returns:
+            会话是否存在
+        """
+        result = db.execute(
+            update(ChatSessionRow)
+            .where(ChatSessionRow.id == session_id)
+            .values(updated_at=SQL_UTC_NOW if now is None else now, **values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
     def _row_to_session(
         self,
         row: ChatSessionRow,
@@ -244,7 +326,7 @@ class ChatRepository:
                     content=msg.content,
                     created_at=msg.created_at,
                 )
-                for msg in sorted(row.messages, key=lambda m: m.created_at)
+                for msg in row.messages  # relationship 已按 created_at 排序
             ]
         
         return ChatSession(
@@ -259,7 +341,6 @@ class ChatRepository:
     def get_session_count(self, paper_id: str) -> int:
         """获取论文的会话数量"""
         with SessionLocal() as db:
-            from sqlalchemy import func
             count = db.execute(
                 select(func.count(ChatSessionRow.id))
                 .where(ChatSessionRow.paper_id == paper_id)
@@ -5,14 +5,25 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     Integer,
+    SmallInteger,
+    Index,
+    Computed,
+    text,
+    func,
 )
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, relationship, deferred
 from datetime import datetime
 
 
 Base = declarative_base()
 
+# 列表页卡片摘要预览的最大字符数
+PREVIEW_CHARS = 400
+
+# 由数据库生成的 UTC 时间（与 DateTime 列一样是 naive UTC），用于 UPDATE ... SET updated_at
+SQL_UTC_NOW = func.timezone("utc", func.now())
+
 
 class PaperRow(Base):
     __tablename__ = "papers"
@@ -28,6 +39,85 @@ class PaperRow(Base):
     arxiv_published = Column(DateTime)
     arxiv_updated = Column(DateTime)
 
+    # PDF 提取的全文：单独成列（TOAST 自动压缩），不放在 paper JSONB 里，
+    # 列表查询 / JSONB 补丁都不会再带上这几十 KB；只在详情读取时加载
+    full_text = deferred(Column(Text))
+
+    # 发布年份（年份筛选 / 年份选项），写入时由 Postgres 生成
+    published_year = Column(
+        SmallInteger,
+        Computed("extract(year from arxiv_published)::smallint", persisted=True),
+    )
+
+    # 列表页搜索用的小写文本（标题 / 摘要 / 作者），写入时由 Postgres 生成
+    # 只用于 WHERE，不随行加载
+    search_blob = deferred(Column(
+        Text,
+        Computed(
+            "lower(coalesce(title, '') || ' ' "
+            "|| coalesce(paper->>'abstract', '') || ' ' "
+            "|| coalesce(paper->>'authors', ''))",
+            persisted=True,
+        ),
+    ))
+
+    # ------- 列表页卡片字段（由 Postgres 从 paper 生成）-------
+    # 列表查询只读这些窄列，不必读取（并解压）整个 paper JSONB（含 full_text）
+    ai_title = deferred(Column(Text, Computed("paper->>'ai_title'", persisted=True)))
+    # 多存一个字符用于判断是否被截断
+    preview = deferred(Column(
+        Text,
+        Computed(
+            "left(coalesce(nullif(paper->>'ai_abstract', ''), paper->>'abstract'), "
+            f"{PREVIEW_CHARS + 1})",
+            persisted=True,
+        ),
+    ))
+    authors = deferred(Column(JSONB, Computed("paper->'authors'", persisted=True)))
+    favorite_folders = deferred(Column(
+        JSONB, Computed("paper->'favorite_folders'", persisted=True)
+    ))
+    is_disliked = deferred(Column(
+        Boolean, Computed("coalesce((paper->>'is_disliked')::boolean, false)", persisted=True)
+    ))
+
+    __table_args__ = (
+        # 列表页 keyset 分页：ORDER BY created_at, id
+        Index("ix_papers_created_at_id", "created_at", "id"),
+        # 列表缓存的版本号：max(updated_at)
+        Index("ix_papers_updated_at", "updated_at"),
+        # 年份范围筛选
+        Index("ix_papers_year_created", "published_year", "created_at"),
+        # 作者筛选：paper->'authors' ?| ARRAY[...]
+        Index("ix_papers_authors_gin", text("(paper -> 'authors')"), postgresql_using="gin"),
+        # 搜索框子串匹配（pg_trgm）
+        Index(
+            "ix_papers_search_blob_trgm",
+            "search_blob",
+            postgresql_using="gin",
+            postgresql_ops={"search_blob": "gin_trgm_ops"},
+        ),
+        # 每日任务的待处理队列（list_missing_*）：部分索引只包含尚未生成的论文，
+        # 谓词需与查询条件保持一致，规划器才会选用
+        Index(
+            "ix_papers_missing_ai_abstract",
+            "created_at",
+            postgresql_where=text("(paper ->> 'ai_abstract') IS NULL"),
+        ),
+        Index(
+            "ix_papers_missing_ai_title",
+            "created_at",
+            postgresql_where=text("(paper ->> 'ai_title') IS NULL"),
+        ),
+        Index(
+            "ix_papers_missing_ai_summary",
+            "created_at",
+            postgresql_where=text(
+                "(paper -> 'ai_summary') IS NULL OR (paper ->> 'ai_summary') = ''"
+            ),
+        ),
+    )
+
 
 class PaperUserMeta(Base):
     __tablename__ = "paper_user_meta"
@@ -54,7 +144,12 @@ class ChatSessionRow(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 关联
-    messages = relationship("ChatMessageRow", back_populates="session", cascade="all, delete-orphan")
+    messages = relationship(
+        "ChatMessageRow",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="ChatMessageRow.created_at",
+    )
 
 
 class ChatMessageRow(Base):
@@ -1,3 +1,6 @@
+import json
+from functools import partial
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.config.config import Config
@@ -6,6 +9,12 @@ from src.config.config import Config
 engine = create_engine(
     Config.database_url,
     pool_pre_ping=True,
+    pool_size=Config.database_pool.pool_size,
+    max_overflow=Config.database_pool.max_overflow,
+    pool_recycle=Config.database_pool.pool_recycle,
+    pool_timeout=Config.database_pool.pool_timeout,
+    # JSONB 写入：紧凑分隔符 + 直接输出 UTF-8（中文标题/摘要不再转成 \uXXXX）
+    json_serializer=partial(json.dumps, ensure_ascii=False, separators=(",", ":")),
 )
 
 SessionLocal = sessionmaker(
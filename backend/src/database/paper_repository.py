@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import re
-from typing import List, Optional, Any, Union, Dict
+from typing import List, Optional, Any, Union, Dict, Sequence, Tuple, Iterator
 from datetime import datetime
 
-from sqlalchemy import select, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, exists, or_, tuple_, func, cast, bindparam, literal, Text
+from sqlalchemy.dialects.postgresql import array, insert, JSONB
+from sqlalchemy.orm import Session, Query
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.ext.compiler import compiles
+from pydantic import TypeAdapter
 
-from src.model.paper import Paper
+from src.model.paper import Paper, PaperPreview
 from src.database.db.session import SessionLocal
-from src.database.db.models import PaperRow
+from src.database.db.models import PaperRow, PREVIEW_CHARS, SQL_UTC_NOW
+
+
+# NULL 字符 (\u0000) 和其他控制字符（保留 \t \n \r）
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
 
 
 def _sanitize_for_jsonb(obj: Any) -> Any:
@@ -21,10 +29,8 @@ def _sanitize_for_jsonb(obj: Any) -> Any:
     - 其他控制字符
     """
     if isinstance(obj, str):
-        # 移除 NULL 字符和其他控制字符
-        obj = obj.replace('\u0000', '')
-        obj = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', obj)
-        return obj
+        # 一次扫描移除 NULL 字符和其他控制字符（预编译的正则）
+        return _CONTROL_CHARS_RE.sub('', obj)
     elif isinstance(obj, dict):
         return {k: _sanitize_for_jsonb(v) for k, v in obj.items()}
     elif isinstance(obj, list):
@@ -33,6 +39,110 @@ def _sanitize_for_jsonb(obj: Any) -> Any:
         return obj
 
 
+# =====================================================
+# Hot-path statements
+#
+# 在模块级构建一次，带 bindparam 重复执行：省去每次调用重新构造
+# select()，并稳定命中 SQLAlchemy 的 compiled cache。
+# =====================================================
+
+# paper JSONB 以文本形式取回（paper::text），由 pydantic-core 直接解析 JSON，
+# 省掉驱动端 json.loads 生成中间 dict 的一步
+_PAPER_TEXT = cast(PaperRow.paper, Text).label("paper")
+
+_SELECT_PAPER_JSON = (
+    select(_PAPER_TEXT, PaperRow.full_text)
+    .where(PaperRow.id == bindparam("paper_id"))
+)
+
+_SELECT_PAPER_FIELD = (
+    select(PaperRow.paper[bindparam("field", type_=Text)].astext)
+    .where(PaperRow.id == bindparam("paper_id"))
+)
+
+# 批量合并 JSON 补丁（executemany，一个事务）；用 Core 表而非 ORM 实体，
+# 避免被当作 ORM 的 "bulk UPDATE by primary key"
+_PATCH_PAPER_BY_ID = (
+    update(PaperRow.__table__)
+    .where(PaperRow.__table__.c.id == bindparam("paper_id"))
+    .values(
+        paper=PaperRow.__table__.c.paper.op("||")(bindparam("patch", type_=JSONB)),
+        updated_at=SQL_UTC_NOW,
+    )
+)
+
+class _Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) <statement>
+
+    作为 SQLAlchemy 语句执行，绑定参数照常经过类型处理器
+    （例如 JSONB 参数会被序列化，而不是以 text[] 发给驱动）。
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+# 列表结果一次性交给 pydantic-core 批量校验，而不是逐个 model_validate
+_PAPER_LIST = TypeAdapter(List[Paper])
+
+
+def _validate_papers(texts: Sequence[str]) -> List[Paper]:
+    """Parse + validate a batch of paper::text values in one pydantic-core call."""
+    return _PAPER_LIST.validate_json("[" + ",".join(texts) + "]")
+
+
+# 列表筛选里不依赖参数的谓词：只构建一次，各查询直接复用
+_NOT_DISLIKED = or_(
+    PaperRow.paper["is_disliked"].is_(None),
+    PaperRow.paper["is_disliked"].astext == "false",
+)
+_NOT_FAVORITED = or_(
+    PaperRow.paper["favorite_folders"].is_(None),
+    PaperRow.paper["favorite_folders"].astext == "[]",
+)
+
+# Paper 的字段名（导入时算一次，update_paper_field 校验字段名用）
+_PAPER_FIELDS = frozenset(Paper.model_fields)
+
+
+def _paper_field_text(field: str):
+    """
+    SQL text value of a Paper field.
+
+    full_text 存在单独的列里（旧数据可能仍在 JSONB 中），其余字段取 paper->>field。
+    """
+    if field == "full_text":
+        return func.coalesce(PaperRow.full_text, PaperRow.paper["full_text"].astext)
+    return PaperRow.paper[field].astext
+
+
+def _paper_row_values(p: Paper) -> Dict[str, Any]:
+    """
+    Column values for a PaperRow INSERT (generated columns excluded).
+
+    updated_at 不在其中：所有写入都用数据库时钟（SQL_UTC_NOW）打时间戳，
+    保证 get_data_version 的 max(updated_at) 单调递增。
+    """
+    return {
+        "id": p.id,
+        "paper": p.model_dump(mode="json", exclude={"full_text"}),
+        "full_text": p.full_text,
+        "title": p.title,
+        "created_at": p.created_at,
+        "arxiv_entry_id": p.arxiv_entry_id,
+        "arxiv_published": p.arxiv_published,
+        "arxiv_updated": p.arxiv_updated,
+    }
+
+
 class PaperRepository:
     """
     Postgres-only repository for Paper.
@@ -49,21 +159,27 @@ class PaperRepository:
         """
         Insert or update a Paper (full overwrite).
         """
+        values = _paper_row_values(paper)
+        # 清理 JSONB 不支持的字符
+        values["paper"] = _sanitize_for_jsonb(values["paper"])
+        values["full_text"] = _sanitize_for_jsonb(values["full_text"])
+
+        # INSERT ... ON CONFLICT (id) DO UPDATE：一条语句完成，
+        # 不需要 merge() 先 SELECT 判断是否存在
+        stmt = insert(PaperRow).values(**values, updated_at=SQL_UTC_NOW)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PaperRow.id],
+            set_={
+                k: stmt.excluded[k] for k in values if k not in ("id", "full_text")
+            } | {
+                "updated_at": SQL_UTC_NOW,
+                # 列表接口读出的 Paper 不带 full_text，保存时不要把已有全文清空
+                "full_text": func.coalesce(stmt.excluded.full_text, PaperRow.full_text),
+            },
+        )
+
         with SessionLocal() as db:
-            # 清理 JSONB 不支持的字符
-            paper_data = _sanitize_for_jsonb(paper.model_dump(mode="json"))
-            
-            row = PaperRow(
-                id=paper.id,
-                paper=paper_data,  
-                title=paper.title,
-                created_at=paper.created_at,
-                updated_at=datetime.utcnow(),
-                arxiv_entry_id=paper.arxiv_entry_id,
-                arxiv_published=paper.arxiv_published,
-                arxiv_updated=paper.arxiv_updated,
-            )
-            db.merge(row)
+            db.execute(stmt)
             db.commit()
 
     def get_paper_by_id(self, paper_id: str) -> Optional[Paper]:
@@ -71,25 +187,86 @@ class PaperRepository:
         Get a Paper by id.
         """
         with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
+            row = db.execute(_SELECT_PAPER_JSON, {"paper_id": paper_id}).first()
+            if row is None:
                 return None
-            return Paper.model_validate(row.paper)
+            paper = Paper.model_validate_json(row.paper)
+            if row.full_text is not None:
+                paper.full_text = row.full_text
+            return paper
 
-    def get_all_papers(self) -> List[Paper]:
+    def exists(self, paper_id: str) -> bool:
         """
-        Load all papers from database.
+        Whether a paper with this id exists.
 
-        ⚠️ Debug / small dataset only.
+        SELECT EXISTS(...) 走主键索引，不加载 paper JSON。
+        """
+        return self._exists(PaperRow.id == paper_id)
+
+    def has_any_field(self, paper_id: str, *fields: str) -> bool:
+        """
+        Whether the paper exists and at least one of `fields` is non-empty.
+        """
+        return self._exists(
+            PaperRow.id == paper_id,
+            or_(*(func.coalesce(_paper_field_text(f), "") != "" for f in fields)),
+        )
+
+    def is_field_missing(self, paper_id: str, field: str) -> bool:
+        """
+        Whether the paper exists and `field` is null / empty.
+        """
+        return self._exists(
+            PaperRow.id == paper_id,
+            func.coalesce(_paper_field_text(field), "") == "",
+        )
+
+    def _exists(self, *criteria) -> bool:
+        with SessionLocal() as db:
+            return bool(db.execute(select(exists().where(*criteria))).scalar())
+
+    def get_all_papers(self, batch_size: int = 200) -> Iterator[Paper]:
+        """
+        Stream all papers with a server-side cursor (without full_text; see get_paper_by_id).
+
+        每次只取 batch_size 行并整批校验，内存占用与总行数无关；
+        只需要前几篇时可以提前停止迭代，需要列表时用 list(...)。
+        """
+        with SessionLocal() as db:
+            result = db.execute(
+                select(_PAPER_TEXT).execution_options(yield_per=batch_size)
+            ).scalars()
+            for rows in result.partitions():
+                yield from _validate_papers(rows)
+
+    def get_data_version(self) -> Optional[datetime]:
+        """
+        Latest updated_at across all papers.
+
+        Every write bumps updated_at, so this works as a cheap version
+        stamp for caching list queries (ix_papers_updated_at).
         """
         with SessionLocal() as db:
-            rows = db.execute(select(PaperRow)).scalars().all()
-            return [Paper.model_validate(r.paper) for r in rows]
+            return db.execute(select(func.max(PaperRow.updated_at))).scalar()
 
     # =====================================================
     # Insert-only logic (crawl / ingest)
     # =====================================================
 
+    def existing_ids(self, paper_ids: Sequence[str]) -> set[str]:
+        """
+        Return the subset of `paper_ids` already stored (one round-trip).
+        """
+        if not paper_ids:
+            return set()
+
+        with SessionLocal() as db:
+            return set(
+                db.execute(
+                    select(PaperRow.id).where(PaperRow.id.in_(paper_ids))
+                ).scalars()
+            )
+
     def insert_new_papers(self, new_papers: List[Paper]) -> List[Paper]:
         """
         Insert only new papers (by Paper.id).
@@ -97,37 +274,31 @@ class PaperRepository:
         if not new_papers:
             return []
 
-        paper_ids = [p.id for p in new_papers if p.id]
+        # 同一批次内的重复 id 只保留第一条
+        batch: Dict[str, Paper] = {}
+        for p in new_papers:
+            if p.id and p.id not in batch:
+                batch[p.id] = p
 
-        with SessionLocal() as db:
-            existing_ids = set(
-                id_
-                for (id_,) in db.execute(
-                    select(PaperRow.id).where(PaperRow.id.in_(paper_ids))
-                )
-            )
+        if not batch:
+            return []
 
-            inserted: List[Paper] = []
-
-            for p in new_papers:
-                if not p.id or p.id in existing_ids:
-                    continue
-
-                row = PaperRow(
-                    id=p.id,
-                    paper=p.model_dump(mode="json"),
-                    title=p.title,
-                    created_at=p.created_at,
-                    updated_at=p.updated_at,
-                    arxiv_entry_id=p.arxiv_entry_id,
-                    arxiv_published=p.arxiv_published,
-                    arxiv_updated=p.arxiv_updated,
-                )
-                db.add(row)
-                inserted.append(p)
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING id：
+        # 已存在的论文由数据库跳过，不需要先 SELECT 一遍
+        stmt = (
+            insert(PaperRow)
+            .values(updated_at=SQL_UTC_NOW)
+            .on_conflict_do_nothing(index_elements=[PaperRow.id])
+            .returning(PaperRow.id)
+        )
 
+        with SessionLocal() as db:
+            inserted_ids = set(
+                db.execute(stmt, [_paper_row_values(p) for p in batch.values()]).scalars()
+            )
             db.commit()
-            return inserted
+
+        return [p for pid, p in batch.items() if pid in inserted_ids]
 
     # =====================================================
     # Partial update (enrichment / metadata)
@@ -137,28 +308,68 @@ class PaperRepository:
         """
         Update a single field inside Paper JSON.
         """
-        if field not in Paper.model_fields:
+        if field not in _PAPER_FIELDS:
             raise ValueError(f"Field '{field}' is not a valid Paper field")
 
+        if field == "full_text":
+            self.update_full_text(paper_id, value)
+            return
+
+        if isinstance(value, datetime):
+            value = value.isoformat()
+
+        # 单条 UPDATE 只发送改动的字段，不读回整个 JSONB
+        self._patch_paper(paper_id, {field: value})
+
+    def _get_paper_field(self, paper_id: str, field: str) -> Optional[str]:
+        """
+        Read one top-level field of the Paper JSON as text (paper->>field).
+        """
         with SessionLocal() as db:
-            row: Optional[PaperRow] = db.get(PaperRow, paper_id)
-            if not row:
-                return
+            return db.execute(
+                _SELECT_PAPER_FIELD, {"paper_id": paper_id, "field": field}
+            ).scalar()
 
-            paper = dict(row.paper)
+    def _patch_paper(self, paper_id: str, patch: Dict[str, Any]) -> bool:
+        """
+        Merge `patch` into the Paper JSON with a single UPDATE (paper || patch).
 
-            if isinstance(value, datetime):
-                value = value.isoformat()
+        不需要先读出整行再写回，一次往返完成。
 
-            # 清理不安全字符
-            value = _sanitize_for_jsonb(value)
+        Returns:
+            True if the paper exists (row updated)
+        """
+        patch = _sanitize_for_jsonb(patch)
+        patch["updated_at"] = datetime.utcnow().isoformat()
 
-            paper[field] = value
-            paper["updated_at"] = datetime.utcnow().isoformat()
+        with SessionLocal() as db:
+            result = db.execute(
+                update(PaperRow)
+                .where(PaperRow.id == paper_id)
+                .values(
+                    paper=PaperRow.paper.op("||")(cast(patch, JSONB)),
+                    updated_at=SQL_UTC_NOW,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return result.rowcount > 0
 
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
+    def _patch_papers(self, patches: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Apply several `_patch_paper` merges in one transaction (executemany).
+        """
+        if not patches:
+            return
+
+        now = datetime.utcnow().isoformat()
+        params = [
+            {"paper_id": paper_id, "patch": {**_sanitize_for_jsonb(patch), "updated_at": now}}
+            for paper_id, patch in patches
+        ]
 
+        with SessionLocal() as db:
+            db.execute(_PATCH_PAPER_BY_ID, params)
             db.commit()
 
     # =====================================================
@@ -176,7 +387,7 @@ class PaperRepository:
         List papers with pagination and sorting.
         """
         with SessionLocal() as db:
-            query = db.query(PaperRow)
+            query = db.query(_PAPER_TEXT)
 
             sort_col = getattr(PaperRow, sort_by, PaperRow.created_at)
             query = (
@@ -192,7 +403,7 @@ class PaperRepository:
                 .all()
             )
 
-            return [Paper.model_validate(r.paper) for r in rows]
+            return _validate_papers([r.paper for r in rows])
 
     # =====================================================
     # Enrichment helpers (daily job)
@@ -204,7 +415,7 @@ class PaperRepository:
         """
         with SessionLocal() as db:
             query = (
-                db.query(PaperRow)
+                db.query(_PAPER_TEXT)
                 .filter(
                     PaperRow.paper.op("->>")("ai_abstract").is_(None), # JSON null
                 )
@@ -215,23 +426,40 @@ class PaperRepository:
                 query = query.limit(limit)
 
             rows = query.all()
-            return [Paper.model_validate(r.paper) for r in rows]
+            return _validate_papers([r.paper for r in rows])
     
-    def update_ai_abstract(self, paper_id: str, ai_abstract: str, provider: str) -> None:
+    def list_missing_ai_abstract_minimal(self, limit: int = -1) -> List[Tuple[str, str]]:
+        """
+        Like list_missing_ai_abstract, but only (id, abstract) pairs.
+
+        只取翻译需要的两个值，不读取整个 paper JSONB，也不做 Pydantic 校验。
+        """
         with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
+            query = (
+                db.query(PaperRow.id, PaperRow.paper["abstract"].astext)
+                .filter(PaperRow.paper.op("->>")("ai_abstract").is_(None))
+                .order_by(PaperRow.created_at.asc())
+            )
 
-            paper = dict(row.paper)
-            paper["ai_abstract"] = _sanitize_for_jsonb(ai_abstract)
-            paper["ai_abstract_provider"] = provider
-            paper["updated_at"] = datetime.utcnow().isoformat()
+            if limit > 0:
+                query = query.limit(limit)
 
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
+            return [tuple(r) for r in query.all()]
 
-            db.commit()
+    def update_ai_abstract(self, paper_id: str, ai_abstract: str, provider: str) -> None:
+        self._patch_paper(paper_id, {
+            "ai_abstract": ai_abstract,
+            "ai_abstract_provider": provider,
+        })
+
+    def update_ai_abstracts(self, items: Sequence[Tuple[str, str]], provider: str) -> None:
+        """
+        Batch version of update_ai_abstract: [(paper_id, ai_abstract)] in one transaction.
+        """
+        self._patch_papers([
+            (paper_id, {"ai_abstract": ai_abstract, "ai_abstract_provider": provider})
+            for paper_id, ai_abstract in items
+        ])
     
     def list_missing_ai_title(self, limit: int = -1) -> List[Paper]:
         """
@@ -239,7 +467,7 @@ class PaperRepository:
         """
         with SessionLocal() as db:
             query = (
-                db.query(PaperRow)
+                db.query(_PAPER_TEXT)
                 .filter(PaperRow.paper.op("->>")("ai_title").is_(None))
                 .order_by(PaperRow.created_at.asc())
             )
@@ -248,23 +476,38 @@ class PaperRepository:
                 query = query.limit(limit)
 
             rows = query.all()
-            return [Paper.model_validate(r.paper) for r in rows]
+            return _validate_papers([r.paper for r in rows])
         
-    def update_ai_title(self, paper_id: str, ai_title: str, provider: str) -> None:
+    def list_missing_ai_title_minimal(self, limit: int = -1) -> List[Tuple[str, str]]:
+        """
+        Like list_missing_ai_title, but only (id, title) pairs.
+        """
         with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
+            query = (
+                db.query(PaperRow.id, PaperRow.title)
+                .filter(PaperRow.paper.op("->>")("ai_title").is_(None))
+                .order_by(PaperRow.created_at.asc())
+            )
 
-            paper = dict(row.paper)   # ⭐ 拷贝一份新的 dict
-            paper["ai_title"] = _sanitize_for_jsonb(ai_title)
-            paper["ai_title_provider"] = provider
-            paper["updated_at"] = datetime.utcnow().isoformat()
+            if limit > 0:
+                query = query.limit(limit)
 
-            row.paper = paper         # ⭐ 整体赋值（SQLAlchemy 能识别）
-            row.updated_at = datetime.utcnow()
+            return [tuple(r) for r in query.all()]
 
-            db.commit()
+    def update_ai_title(self, paper_id: str, ai_title: str, provider: str) -> None:
+        self._patch_paper(paper_id, {
+            "ai_title": ai_title,
+            "ai_title_provider": provider,
+        })
+
+    def update_ai_titles(self, items: Sequence[Tuple[str, str]], provider: str) -> None:
+        """
+        Batch version of update_ai_title: [(paper_id, ai_title)] in one transaction.
+        """
+        self._patch_papers([
+            (paper_id, {"ai_title": ai_title, "ai_title_provider": provider})
+            for paper_id, ai_title in items
+        ])
 
     def list_missing_ai_summary(self, limit: int = 5) -> List[Paper]:
         """
@@ -272,7 +515,7 @@ class PaperRepository:
         """
         with SessionLocal() as db:
             rows = (
-                db.query(PaperRow)
+                db.query(_PAPER_TEXT)
                 .filter(
                     (PaperRow.paper["ai_summary"].is_(None))
                     | (PaperRow.paper.op("->>")("ai_summary") == "")
@@ -281,13 +524,29 @@ class PaperRepository:
                 .limit(limit)
                 .all()
             )
-            return [Paper.model_validate(r.paper) for r in rows]
+            return _validate_papers([r.paper for r in rows])
 
     def update_full_text(self, paper_id: str, full_text: str) -> None:
         """
-        Update extracted full text.
+        Update extracted full text (stored in its own column, not in the JSONB).
         """
-        self.update_paper_field(paper_id, "full_text", full_text)
+        patch = {"updated_at": datetime.utcnow().isoformat()}
+
+        with SessionLocal() as db:
+            db.execute(
+                update(PaperRow)
+                .where(PaperRow.id == paper_id)
+                .values(
+                    full_text=_sanitize_for_jsonb(full_text),
+                    # 顺带去掉旧数据里残留在 JSONB 中的 full_text
+                    paper=PaperRow.paper.op("-")(literal("full_text", Text)).op("||")(
+                        cast(patch, JSONB)
+                    ),
+                    updated_at=SQL_UTC_NOW,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
 
     def update_ai_summary(
         self,
@@ -298,20 +557,10 @@ class PaperRepository:
         """
         Update ai_summary and its provider.
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
-
-            paper = dict(row.paper)
-            paper["ai_summary"] = _sanitize_for_jsonb(ai_summary)
-            paper["ai_summary_provider"] = provider
-            paper["updated_at"] = datetime.utcnow().isoformat()
-
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
-
-            db.commit()
+        self._patch_paper(paper_id, {
+            "ai_summary": ai_summary,
+            "ai_summary_provider": provider,
+        })
 
     # =====================================================
     # Job status tracking
@@ -323,29 +572,13 @@ class PaperRepository:
 
         Status values: pending | running | completed | failed
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
-
-            paper = dict(row.paper)
-            paper["summary_job_status"] = status
-            paper["updated_at"] = datetime.utcnow().isoformat()
-
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
-
-            db.commit()
+        self._patch_paper(paper_id, {"summary_job_status": status})
 
     def get_summary_job_status(self, paper_id: str) -> Optional[str]:
         """
         Get summary_job_status for a paper.
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return None
-            return row.paper.get("summary_job_status")
+        return self._get_paper_field(paper_id, "summary_job_status")
 
     def update_comic_job_status(self, paper_id: str, status: str) -> None:
         """
@@ -353,29 +586,13 @@ class PaperRepository:
 
         Status values: pending | running | completed | failed
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
-
-            paper = dict(row.paper)
-            paper["comic_job_status"] = status
-            paper["updated_at"] = datetime.utcnow().isoformat()
-
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
-
-            db.commit()
+        self._patch_paper(paper_id, {"comic_job_status": status})
 
     def get_comic_job_status(self, paper_id: str) -> Optional[str]:
         """
         Get comic_job_status for a paper.
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return None
-            return row.paper.get("comic_job_status")
+        return self._get_paper_field(paper_id, "comic_job_status")
 
     # =====================================================
     # Favorite folders
@@ -409,7 +626,7 @@ class PaperRepository:
             paper["updated_at"] = datetime.utcnow().isoformat()
 
             row.paper = paper
-            row.updated_at = datetime.utcnow()
+            row.updated_at = SQL_UTC_NOW
 
             db.commit()
             return True
@@ -442,7 +659,7 @@ class PaperRepository:
             paper["updated_at"] = datetime.utcnow().isoformat()
 
             row.paper = paper
-            row.updated_at = datetime.utcnow()
+            row.updated_at = SQL_UTC_NOW
 
             db.commit()
             return True
@@ -454,28 +671,26 @@ class PaperRepository:
         with SessionLocal() as db:
             # Query papers where favorite_folders contains folder_name
             rows = (
-                db.query(PaperRow)
+                db.query(_PAPER_TEXT)
                 .filter(
                     PaperRow.paper["favorite_folders"].contains([folder_name])
                 )
                 .order_by(PaperRow.updated_at.desc())
                 .all()
             )
-            return [Paper.model_validate(r.paper) for r in rows]
+            return _validate_papers([r.paper for r in rows])
 
     def get_all_folders(self) -> List[str]:
         """
         Get all unique folder names across all papers.
         """
         with SessionLocal() as db:
-            rows = db.query(PaperRow).all()
-
-            all_folders: set[str] = set()
-            for row in rows:
-                folders = row.paper.get("favorite_folders") or []
-                all_folders.update(folders)
-
-            return sorted(all_folders)
+            folders = self._folder_names_subquery()
+            return list(
+                db.execute(
+                    select(folders.c.folder).distinct().order_by(folders.c.folder)
+                ).scalars()
+            )
 
     def get_folder_counts(self) -> dict[str, int]:
         """
@@ -485,15 +700,25 @@ class PaperRepository:
             Dict mapping folder_name -> count
         """
         with SessionLocal() as db:
-            rows = db.query(PaperRow).all()
-
-            counts: dict[str, int] = {}
-            for row in rows:
-                folders = row.paper.get("favorite_folders") or []
-                for folder in folders:
-                    counts[folder] = counts.get(folder, 0) + 1
+            folders = self._folder_names_subquery()
+            rows = db.execute(
+                select(folders.c.folder, func.count())
+                .group_by(folders.c.folder)
+            )
+            return {folder: count for folder, count in rows}
 
-            return counts
+    def _folder_names_subquery(self):
+        """
+        One row per (paper, folder): 在 Postgres 中展开 favorite_folders，
+        不把整张表加载到 Python。
+        """
+        return (
+            select(
+                func.jsonb_array_elements_text(PaperRow.favorite_folders).label("folder")
+            )
+            .where(func.jsonb_typeof(PaperRow.favorite_folders) == "array")
+            .subquery()
+        )
 
     def rename_folder(self, old_name: str, new_name: str) -> int:
         """
@@ -535,7 +760,7 @@ class PaperRepository:
                     paper["updated_at"] = datetime.utcnow().isoformat()
 
                     row.paper = paper
-                    row.updated_at = datetime.utcnow()
+                    row.updated_at = SQL_UTC_NOW
                     count += 1
 
             db.commit()
@@ -575,7 +800,7 @@ class PaperRepository:
                     paper["updated_at"] = datetime.utcnow().isoformat()
 
                     row.paper = paper
-                    row.updated_at = datetime.utcnow()
+                    row.updated_at = SQL_UTC_NOW
                     count += 1
 
             db.commit()
@@ -606,39 +831,69 @@ class PaperRepository:
         """
         Mark a paper as disliked.
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
-
-            paper = dict(row.paper)
-            paper["is_disliked"] = True
-            paper["disliked_at"] = datetime.utcnow().isoformat()
-            paper["updated_at"] = datetime.utcnow().isoformat()
-
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
-
-            db.commit()
+        self._patch_paper(paper_id, {
+            "is_disliked": True,
+            "disliked_at": datetime.utcnow().isoformat(),
+        })
 
     def unmark_disliked(self, paper_id: str) -> None:
         """
         Remove dislike mark from a paper.
         """
-        with SessionLocal() as db:
-            row = db.get(PaperRow, paper_id)
-            if not row:
-                return
+        self._patch_paper(paper_id, {
+            "is_disliked": False,
+            "disliked_at": None,
+        })
 
-            paper = dict(row.paper)
-            paper["is_disliked"] = False
-            paper["disliked_at"] = None
-            paper["updated_at"] = datetime.utcnow().isoformat()
+    def _apply_list_filters(
+        self,
+        query: Query,
+        include_disliked: bool = False,
+        include_favorite: bool = False,
+        folder_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        authors: Optional[Sequence[str]] = None,
+        year_range: Optional[Tuple[int, int]] = None,
+    ) -> Query:
+        """
+        Apply the list-view filters shared by list / count queries.
+        """
+        # Filter out disliked papers by default
+        if not include_disliked:
+            query = query.filter(_NOT_DISLIKED)
+
+        # Filter by folder (takes priority over include_favorite)
+        if folder_filter:
+            # 当指定收藏夹时，只看该收藏夹内的论文
+            query = query.filter(
+                PaperRow.paper["favorite_folders"].contains([folder_filter])
+            )
+        elif not include_favorite:
+            # 只有在没有指定收藏夹筛选时，才过滤掉收藏的论文
+            query = query.filter(_NOT_FAVORITED)
+
+        # Text search（标题 / 摘要 / 作者，大小写不敏感的子串匹配，走 trigram 索引）
+        search = (search or "").strip().lower()
+        if search:
+            query = query.filter(PaperRow.search_blob.contains(search, autoescape=True))
+
+        # Author filter: 任一作者命中即可（写成 -> 以匹配 ix_papers_authors_gin 的索引表达式）
+        if authors:
+            query = query.filter(
+                PaperRow.paper.op("->")("authors").op("?|", is_comparison=True)(array(list(authors)))
+            )
 
-            row.paper = paper
-            row.updated_at = datetime.utcnow()
+        # Year filter: 没有发布时间的论文不过滤
+        if year_range:
+            y_min, y_max = year_range
+            query = query.filter(
+                or_(
+                    PaperRow.published_year.is_(None),
+                    PaperRow.published_year.between(y_min, y_max),
+                )
+            )
 
-            db.commit()
+        return query
 
     def list_with_filters(
         self,
@@ -663,31 +918,12 @@ class PaperRepository:
             folder_filter: If set, only return papers in this folder
         """
         with SessionLocal() as db:
-            query = db.query(PaperRow)
-
-            # Filter out disliked papers by default
-            if not include_disliked:
-                query = query.filter(
-                    or_(
-                        PaperRow.paper["is_disliked"].is_(None),
-                        PaperRow.paper["is_disliked"].astext == "false",
-                    )
-                )
-
-            # Filter by folder (takes priority over include_favorite)
-            if folder_filter:
-                # 当指定收藏夹时，只看该收藏夹内的论文
-                query = query.filter(
-                    PaperRow.paper["favorite_folders"].contains([folder_filter])
-                )
-            elif not include_favorite:
-                # 只有在没有指定收藏夹筛选时，才过滤掉收藏的论文
-                query = query.filter(
-                    or_(
-                        PaperRow.paper["favorite_folders"].is_(None),
-                        PaperRow.paper["favorite_folders"].astext == "[]",
-                    )
-                )
+            query = self._apply_list_filters(
+                db.query(_PAPER_TEXT),
+                include_disliked=include_disliked,
+                include_favorite=include_favorite,
+                folder_filter=folder_filter,
+            )
 
             # Sorting
             sort_col = getattr(PaperRow, sort_by, PaperRow.created_at)
@@ -705,30 +941,184 @@ class PaperRepository:
                 .all()
             )
 
-            return [Paper.model_validate(r.paper) for r in rows]
+            return _validate_papers([r.paper for r in rows])
+
+    def list_keyset(
+        self,
+        cursor: Optional[Tuple[datetime, str]] = None,
+        limit: int = 20,
+        order: str = "desc",
+        include_disliked: bool = False,
+        include_favorite: bool = False,
+        folder_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        authors: Optional[Sequence[str]] = None,
+        year_range: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[List[PaperPreview], Optional[Tuple[datetime, str]]]:
+        """
+        List papers with keyset pagination on (created_at, id).
+
+        与 OFFSET 分页不同，翻页时只扫描当前页需要的行
+        （配合 ix_papers_created_at_id 索引）。
+        只查询卡片需要的窄列（生成列），不读取整个 paper JSONB。
+
+        Args:
+            cursor: (created_at, id) of the last row on the previous page,
+                None for the first page
+            limit: Number of items per page
+
+        Returns:
+            (papers, next_cursor) - next_cursor is None on the last page
+        """
+        with SessionLocal() as db:
+            columns = db.query(
+                PaperRow.id,
+                PaperRow.title,
+                PaperRow.created_at,
+                PaperRow.published_year,
+                PaperRow.ai_title,
+                PaperRow.preview,
+                PaperRow.authors,
+                PaperRow.favorite_folders,
+                PaperRow.is_disliked,
+            )
+            query = self._apply_list_filters(
+                columns,
+                include_disliked=include_disliked,
+                include_favorite=include_favorite,
+                folder_filter=folder_filter,
+                search=search,
+                authors=authors,
+                year_range=year_range,
+            )
+
+            key = tuple_(PaperRow.created_at, PaperRow.id)
+            if order == "desc":
+                if cursor:
+                    query = query.filter(key < tuple_(*cursor))
+                query = query.order_by(PaperRow.created_at.desc(), PaperRow.id.desc())
+            else:
+                if cursor:
+                    query = query.filter(key > tuple_(*cursor))
+                query = query.order_by(PaperRow.created_at.asc(), PaperRow.id.asc())
+
+            # 多取一行用于判断是否还有下一页
+            rows = query.limit(limit + 1).all()
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = (rows[-1].created_at, rows[-1].id)
+
+            return [self._row_to_preview(r) for r in rows], next_cursor
+
+    def _row_to_preview(self, row) -> PaperPreview:
+        preview = row.preview or ""
+        if len(preview) > PREVIEW_CHARS:
+            preview = preview[:PREVIEW_CHARS].rstrip() + "..."
+
+        authors = row.authors or []
+        authors_display = ", ".join(authors[:3]) + (" ..." if len(authors) > 3 else "")
+
+        # 数据来自数据库生成列，类型已确定：用 model_construct 跳过逐字段校验
+        return PaperPreview.model_construct(
+            id=row.id,
+            title=row.title or "",
+            ai_title=row.ai_title,
+            preview=preview,
+            authors=authors,
+            published_year=row.published_year,
+            favorite_folders=row.favorite_folders or [],
+            is_disliked=bool(row.is_disliked),
+            authors_display=authors_display,
+            year_display=str(row.published_year) if row.published_year else "",
+        )
+
+    def distinct_authors(
+        self,
+        include_disliked: bool = False,
+        include_favorite: bool = False,
+        folder_filter: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Distinct author names (sorted) among papers matching the filters.
+        """
+        with SessionLocal() as db:
+            author = func.jsonb_array_elements_text(PaperRow.paper["authors"]).label("author")
+            query = self._apply_list_filters(
+                db.query(author),
+                include_disliked=include_disliked,
+                include_favorite=include_favorite,
+                folder_filter=folder_filter,
+            )
+            return [a for (a,) in query.distinct().order_by(author)]
+
+    def distinct_years(
+        self,
+        include_disliked: bool = False,
+        include_favorite: bool = False,
+        folder_filter: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Distinct publish years (sorted) among papers matching the filters.
+        """
+        with SessionLocal() as db:
+            year = PaperRow.published_year
+            query = self._apply_list_filters(
+                db.query(year).filter(year.is_not(None)),
+                include_disliked=include_disliked,
+                include_favorite=include_favorite,
+                folder_filter=folder_filter,
+            )
+            return [y for (y,) in query.distinct().order_by(year)]
 
     def count_with_filters(
         self,
         include_disliked: bool = False,
+        include_favorite: bool = False,
         folder_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        authors: Optional[Sequence[str]] = None,
+        year_range: Optional[Tuple[int, int]] = None,
     ) -> int:
         """
         Count papers with filters (for pagination).
         """
         with SessionLocal() as db:
-            query = db.query(PaperRow)
-
-            if not include_disliked:
-                query = query.filter(
-                    or_(
-                        PaperRow.paper["is_disliked"].is_(None),
-                        PaperRow.paper["is_disliked"].astext == "false",
-                    )
-                )
+            query = self._apply_list_filters(
+                db.query(PaperRow),
+                include_disliked=include_disliked,
+                include_favorite=include_favorite,
+                folder_filter=folder_filter,
+                search=search,
+                authors=authors,
+                year_range=year_range,
+            )
+            return query.count()
 
-            if folder_filter:
-                query = query.filter(
-                    PaperRow.paper["favorite_folders"].contains([folder_filter])
-                )
+    def count_estimate(
+        self,
+        include_disliked: bool = False,
+        include_favorite: bool = False,
+        folder_filter: Optional[str] = None,
+        search: Optional[str] = None,
+        authors: Optional[Sequence[str]] = None,
+        year_range: Optional[Tuple[int, int]] = None,
+    ) -> int:
+        """
+        Planner row estimate for the filtered list.
 
-            return query.count()
\ No newline at end of file
+        只跑 EXPLAIN，不扫描数据；大表上比 COUNT(*) 便宜得多，但只是估计值。
+        """
+        with SessionLocal() as db:
+            query = self._apply_list_filters(
+                db.query(PaperRow.id),
+                include_disliked=include_disliked,
+                include_favorite=include_favorite,
+                folder_filter=folder_filter,
+                search=search,
+                authors=authors,
+                year_range=year_range,
+            )
+            plan = db.execute(_Explain(query.statement)).scalar()
+            return int(plan[0]["Plan"]["Plan Rows"])
@@ -1,4 +1,7 @@
 from typing import List
+
+from sqlalchemy.dialects.postgresql import insert
+
 from src.database.db.session import SessionLocal
 from src.database.db.models import PaperUserMeta
 
@@ -9,21 +12,21 @@ class PaperUserMetaRepository:
     """
 
     def set_like(self, user_id: str, paper_id: str, liked: bool) -> None:
-        with SessionLocal() as db:
-            meta = (
-                db.query(PaperUserMeta)
-                .filter_by(user_id=user_id, paper_id=paper_id)
-                .first()
-            )
+        """
+        Upsert the like flag in one statement (INSERT ... ON CONFLICT DO UPDATE).
+        """
+        stmt = insert(PaperUserMeta).values(
+            user_id=user_id,
+            paper_id=paper_id,
+            liked=liked,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PaperUserMeta.user_id, PaperUserMeta.paper_id],
+            set_={"liked": stmt.excluded.liked},
+        )
 
-            if not meta:
-                meta = PaperUserMeta(
-                    user_id=user_id,
-                    paper_id=paper_id,
-                )
-                db.add(meta)
-
-            meta.liked = liked
+        with SessionLocal() as db:
+            db.execute(stmt)
             db.commit()
 
     def list_liked(
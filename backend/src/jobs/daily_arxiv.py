@@ -12,12 +12,13 @@ It is safe to be called by:
 
 import asyncio
 import arxiv
-from tqdm import tqdm
 
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
@@ -26,17 +27,23 @@ from src.crawler.arxiv_client import ArxivClient
 from src.database.paper_repository import PaperRepository
 from src.service.llm_service import (
     init_litellm,
-    translate_summary,
-    translate_title,
+    translate_summary_async,
+    translate_title_async,
 )
 from src.config import Config
 
 
-
 def setup_logging(
     level=logging.INFO,
     log_file: str = "daily_arxiv.log",
-):
+) -> QueueListener:
+    """
+    本任务的日志：控制台 + 滚动文件，经 QueueListener 在后台线程写出。
+
+    QueueHandler 直接挂在本模块的 logger 上，而不是 basicConfig：
+    RQ worker / scheduler 进程已经配置过 root logger，basicConfig 会是空操作。
+    返回的 listener 需由调用方用 teardown_logging() 停止。
+    """
     formatter = logging.Formatter(
         fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
@@ -55,10 +62,83 @@ def setup_logging(
     )
     file_handler.setFormatter(formatter)
 
-    logging.basicConfig(
-        level=level,
-        handlers=[console_handler, file_handler],
-    )
+    # 控制台 / 文件写入交给监听线程，事件循环里记录日志只是入队，不阻塞并发任务
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, file_handler)
+
+    job_logger = logging.getLogger(__name__)
+    job_logger.handlers = [QueueHandler(log_queue)]
+    job_logger.setLevel(level)
+    job_logger.propagate = False  # 不再重复输出到 worker 的 root handler
+
+    listener.start()
+    return listener
+
+
+def teardown_logging(listener: QueueListener) -> None:
+    """
+    写完队列中剩余的日志并关闭文件。
+
+    在任务结束时显式调用：RQ 的 work-horse 子进程以 os._exit 退出，atexit 不会执行。
+    """
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+    job_logger = logging.getLogger(__name__)
+    job_logger.handlers = []
+    job_logger.propagate = True
+
+
+# 翻译结果攒够一批再写库：每批一个事务，而不是每篇论文一次提交
+UPDATE_BATCH_SIZE = 50
+
+
+async def _translate_and_save(
+    items: List[Tuple[str, str]],
+    translate: Callable[[str], Awaitable[str]],
+    save_many: Callable[[List[Tuple[str, str]]], None],
+    semaphore: asyncio.Semaphore,
+    label: str,
+    logger: logging.Logger,
+) -> None:
+    """
+    并发翻译 [(paper_id, text)]，结果按 UPDATE_BATCH_SIZE 分批写回数据库
+    """
+    pending: List[Tuple[str, str]] = []
+    saved = failed = 0
+
+    async def _flush():
+        nonlocal pending, saved, failed
+        batch, pending = pending, []
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(save_many, batch)
+            saved += len(batch)
+            logger.info(f"💾 {label}: {saved}/{len(items)} saved")
+        except Exception as e:
+            failed += len(batch)
+            logger.error(f"❌ {label} save failed for {len(batch)} papers ({e})")
+
+    async def _one(paper_id: str, text: str):
+        nonlocal failed
+        async with semaphore:
+            try:
+                translated = await translate(text)
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ {label} failed: {paper_id} ({e})")
+                return
+        logger.debug(f"🔍 {label} translated: {paper_id} -> {translated}")
+        pending.append((paper_id, translated))
+        if len(pending) >= UPDATE_BATCH_SIZE:
+            await _flush()
+
+    await asyncio.gather(*(_one(*item) for item in items))
+    await _flush()
+
+    logger.info(f"✅ {label}: total={len(items)} saved={saved} failed={failed}")
 
 
 def run_daily_arxiv_job() -> None:
@@ -73,8 +153,14 @@ def run_daily_arxiv_job() -> None:
 
 
 async def _run():
-    setup_logging()
-    logger = logging.getLogger(__name__)
+    listener = setup_logging()
+    try:
+        await _run_job(logging.getLogger(__name__))
+    finally:
+        teardown_logging(listener)
+
+
+async def _run_job(logger: logging.Logger):
     logger.info("🌿 LavenderSentinel — Daily ArXiv Job started")
 
     # --- Init ---
@@ -91,51 +177,57 @@ async def _run():
         sort_by=arxiv.SortCriterion.SubmittedDate,
     )
 
-    total_inserted = 0
+    # 一次查询拿到所有已存在的 id，同时去掉跨关键词的重复论文
+    known_ids = repo.existing_ids([
+        p.id for papers in keyword_results.values() for p in papers if p.id
+    ])
+    new_papers = []
 
     for kw, papers in keyword_results.items():
-        inserted = repo.insert_new_papers(papers)
-        total_inserted += len(inserted)
-        logger.info(f"📌 keyword='{kw}' fetched={len(papers)} inserted={len(inserted)}")
+        fresh = [p for p in papers if p.id and p.id not in known_ids]
+        known_ids.update(p.id for p in fresh)
+        new_papers.extend(fresh)
+        logger.info(f"📌 keyword='{kw}' fetched={len(papers)} new={len(fresh)}")
+
+    inserted = repo.insert_new_papers(new_papers)
 
-    logger.info(f"📚 Total new papers inserted: {total_inserted}")
+    logger.info(f"📚 Total new papers inserted: {len(inserted)}")
+
+    # LLM 调用是网络 I/O，按 max_concurrency 并发；数据库写入放到线程中执行
+    semaphore = asyncio.Semaphore(Config.chat_litellm.max_concurrency)
+    provider = Config.chat_litellm.model
 
     # ---------- AI title ----------
     if Config.auto_ai_title:
         logger.info("🤖 Generating AI titles...")
 
-        papers = repo.list_missing_ai_title(limit=-1)
+        papers = repo.list_missing_ai_title_minimal(limit=-1)
         logger.info(f"🔍 Total papers to process for AI title: {len(papers)}")
 
-        for paper in tqdm(papers, desc="Generating AI titles"):
-            try:
-                translated = translate_title(paper.title)
-                logger.info(f"🔍 AI title translated: {translated}")
-                repo.update_ai_title(
-                    paper_id=paper.id,
-                    ai_title=translated,
-                    provider=Config.chat_litellm.model,
-                )
-            except Exception as e:
-                logger.error(f"❌ AI title failed: {paper.id} ({e})")
+        await _translate_and_save(
+            papers,
+            translate=translate_title_async,
+            save_many=lambda batch: repo.update_ai_titles(batch, provider=provider),
+            semaphore=semaphore,
+            label="AI title",
+            logger=logger,
+        )
 
     # ---------- AI abstract ----------
     if Config.auto_ai_abstract:
         logger.info("🤖 Generating AI abstracts...")
 
-        papers = repo.list_missing_ai_abstract(limit=-1)
+        papers = repo.list_missing_ai_abstract_minimal(limit=-1)
         logger.info(f"🔍 Total papers to process for AI abstract: {len(papers)}")
 
-        for paper in tqdm(papers, desc="Generating AI abstracts"):
-            try:
-                translated = translate_summary(paper.abstract)
-                repo.update_ai_abstract(
-                    paper_id=paper.id,
-                    ai_abstract=translated,
-                    provider=Config.chat_litellm.model,
-                )
-            except Exception as e:
-                logger.error(f"❌ AI abstract failed: {paper.id} ({e})")
+        await _translate_and_save(
+            papers,
+            translate=translate_summary_async,
+            save_many=lambda batch: repo.update_ai_abstracts(batch, provider=provider),
+            semaphore=semaphore,
+            label="AI abstract",
+            logger=logger,
+        )
 
     logger.info("🎉 Daily ArXiv job finished")
 
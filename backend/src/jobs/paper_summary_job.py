@@ -8,6 +8,7 @@ Paper Summary Job - 单篇论文 AI 总结后台任务
 - CLI 手动触发
 """
 
+import hashlib
 import logging
 from pathlib import Path
 from typing import Optional
@@ -16,10 +17,15 @@ from src.database.paper_repository import PaperRepository
 from src.service.llm_service import init_litellm, summarize_long_markdown
 from src.service.pdf_parser_service import extract_pdf_markdown
 from src.service.pdf_download_service import PdfDownloader
+from src.queue.connection import get_redis_connection
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# 总结结果缓存：相同模型 + 语言 + 全文 直接复用，避免重复调用 LLM
+SUMMARY_CACHE_PREFIX = "summary_cache:"
+SUMMARY_CACHE_TTL = 30 * 24 * 3600  # 30 天
+
 
 class SummaryJobStatus:
     """任务状态常量"""
@@ -29,6 +35,30 @@ class SummaryJobStatus:
     FAILED = "failed"
 
 
+def _summary_cache_key(md_text: str, model: str, language: str) -> str:
+    digest = hashlib.sha256(
+        "\0".join((model, language, md_text)).encode("utf-8")
+    ).hexdigest()
+    return SUMMARY_CACHE_PREFIX + digest
+
+
+def _get_cached_summary(key: str) -> Optional[str]:
+    """读取缓存的总结；Redis 不可用时视为未命中"""
+    try:
+        cached = get_redis_connection().get(key)
+    except Exception as e:
+        logger.warning(f"⚠️ Summary cache read failed: {e}")
+        return None
+    return cached.decode("utf-8") if cached else None
+
+
+def _set_cached_summary(key: str, summary: str) -> None:
+    try:
+        get_redis_connection().setex(key, SUMMARY_CACHE_TTL, summary.encode("utf-8"))
+    except Exception as e:
+        logger.warning(f"⚠️ Summary cache write failed: {e}")
+
+
 def run_paper_summary_job(paper_id: str) -> None:
     """
     APScheduler 入口：生成单篇论文的 AI 全文总结
@@ -73,14 +103,21 @@ def run_paper_summary_job(paper_id: str) -> None:
         # 保存全文
         repo.update_full_text(paper_id, md_text)
 
-        # --- Step 3: 生成 AI 总结 ---
-        logger.info(f"🤖 Generating AI summary...")
-        init_litellm()
+        # --- Step 3: 生成 AI 总结（优先命中缓存） ---
+        cache_key = _summary_cache_key(md_text, Config.chat_litellm.model, Config.language)
+        summary = _get_cached_summary(cache_key)
 
-        summary = summarize_long_markdown(
-            md_text,
-            language=Config.language,
-        )
+        if summary is not None:
+            logger.info(f"♻️ Reusing cached AI summary")
+        else:
+            logger.info(f"🤖 Generating AI summary...")
+            init_litellm()
+
+            summary = summarize_long_markdown(
+                md_text,
+                language=Config.language,
+            )
+            _set_cached_summary(cache_key, summary)
 
         # --- Step 4: 保存总结 ---
         repo.update_ai_summary(
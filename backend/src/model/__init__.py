@@ -1,3 +1,3 @@
-from .paper import Paper
+from .paper import Paper, PaperPreview
 
-__all__ = ["Paper"]
\ No newline at end of file
+__all__ = ["Paper", "PaperPreview"]
\ No newline at end of file
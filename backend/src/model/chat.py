@@ -9,9 +9,24 @@ Chat 数据模型
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
+import os
+import time
 import uuid
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 v7): 48-bit Unix 毫秒时间戳 + 随机位
+
+    新会话 id 单调递增，插入总落在主键 B-tree 的尾部。
+    """
+    ms = time.time_ns() // 1_000_000
+    value = (ms & ((1 << 48) - 1)) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 class ChatMessage(BaseModel):
     """聊天消息"""
     id: Optional[int] = None
@@ -23,7 +38,7 @@ class ChatMessage(BaseModel):
 
 class ChatSession(BaseModel):
     """聊天会话"""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: str(uuid7()))
     paper_id: str
     title: Optional[str] = None  # 自动生成的标题
     
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
 import arxiv
@@ -61,4 +61,24 @@ class Paper(BaseModel):
         "str_strip_whitespace": True,
         "validate_assignment": True,
         "extra": "ignore", 
-    }
\ No newline at end of file
+    }
+
+
+class PaperPreview(BaseModel):
+    """
+    列表页卡片用的精简 Paper
+    - 只包含卡片需要的字段，摘要已截断为 preview
+    """
+
+    id: str
+    title: str
+    ai_title: Optional[str] = None
+    preview: str = ""
+    authors: List[str] = Field(default_factory=list)
+    published_year: Optional[int] = None
+    favorite_folders: List[str] = Field(default_factory=list)
+    is_disliked: bool = False
+
+    # 预先拼好的展示字符串（构建时计算一次，渲染时直接使用）
+    authors_display: str = ""
+    year_display: str = ""
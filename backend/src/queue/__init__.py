@@ -30,6 +30,8 @@ from .tasks import (
     get_comic_recent_finished_jobs,
     get_comic_failed_jobs,
     get_comic_queue_size,
+    # Default queue
+    enqueue_daily_arxiv_job,
 )
 
 __all__ = [
@@ -58,5 +60,7 @@ __all__ = [
     "get_comic_recent_finished_jobs",
     "get_comic_failed_jobs",
     "get_comic_queue_size",
+    # Default 队列任务
+    "enqueue_daily_arxiv_job",
 ]
 
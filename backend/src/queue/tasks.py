@@ -11,7 +11,18 @@ from typing import Optional, List, Dict, Any
 from rq.job import Job, JobStatus
 from rq.registry import FinishedJobRegistry, FailedJobRegistry, StartedJobRegistry
 
-from .connection import get_redis_connection, get_summary_queue, get_comic_queue
+from .connection import get_redis_connection, get_summary_queue, get_comic_queue, get_default_queue
+
+
+def _fetch_jobs(job_ids: List[str], conn) -> List[Job]:
+    """
+    一次 pipeline 批量取回多个 Job（替代逐个 Job.fetch 的 N 次往返）
+
+    已过期 / 不存在的 job 会被跳过。
+    """
+    if not job_ids:
+        return []
+    return [job for job in Job.fetch_many(job_ids, connection=conn) if job is not None]
 
 
 def enqueue_summary_job(paper_id: str) -> str:
@@ -66,6 +77,28 @@ def enqueue_comic_job(paper_id: str) -> str:
     return job.id
 
 
+def enqueue_daily_arxiv_job() -> str:
+    """
+    提交一次 arXiv 抓取任务到 default 队列（任务监控页的"立即执行"）
+    
+    Returns:
+        job_id: RQ 任务 ID，可用于查询状态
+    """
+    # 延迟导入，避免循环依赖
+    from src.jobs.daily_arxiv import run_daily_arxiv_job
+    
+    queue = get_default_queue()
+    
+    job = queue.enqueue(
+        run_daily_arxiv_job,
+        job_timeout='10h',      # 超时 10 小时
+        result_ttl=86400,       # 结果保留 24 小时
+        failure_ttl=86400 * 7,  # 失败记录保留 7 天
+    )
+    
+    return job.id
+
+
 def get_job_status(job_id: str) -> Optional[str]:
     """
     查询任务状态
@@ -130,7 +163,7 @@ def get_pending_jobs() -> List[Dict[str, Any]]:
             "job_id": job.id,
             "paper_id": job.args[0] if job.args else None,
             "enqueued_at": job.enqueued_at,
-            "status": job.get_status(),
+            "status": job.get_status(refresh=False),  # queue.jobs 已带回状态
         })
     
     return jobs
@@ -229,9 +262,8 @@ def get_recent_finished_jobs(hours: int = 24) -> List[Dict[str, Any]]:
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
     
     jobs = []
-    for job_id in finished_registry.get_job_ids():
+    for job in _fetch_jobs(finished_registry.get_job_ids(), conn):
         try:
-            job = Job.fetch(job_id, connection=conn)
             # 检查完成时间
             if job.ended_at and job.ended_at >= cutoff:
                 jobs.append({
@@ -262,9 +294,8 @@ def get_failed_jobs() -> List[Dict[str, Any]]:
     failed_registry = FailedJobRegistry(queue=queue)
     
     jobs = []
-    for job_id in failed_registry.get_job_ids():
+    for job in _fetch_jobs(failed_registry.get_job_ids(), conn):
         try:
-            job = Job.fetch(job_id, connection=conn)
             jobs.append({
                 "job_id": job.id,
                 "paper_id": job.args[0] if job.args else None,
@@ -294,9 +325,8 @@ def get_started_jobs() -> List[Dict[str, Any]]:
     started_registry = StartedJobRegistry(queue=queue)
     
     jobs = []
-    for job_id in started_registry.get_job_ids():
+    for job in _fetch_jobs(started_registry.get_job_ids(), conn):
         try:
-            job = Job.fetch(job_id, connection=conn)
             jobs.append({
                 "job_id": job.id,
                 "paper_id": job.args[0] if job.args else None,
@@ -351,7 +381,7 @@ def get_comic_pending_jobs() -> List[Dict[str, Any]]:
             "job_id": job.id,
             "paper_id": job.args[0] if job.args else None,
             "enqueued_at": job.enqueued_at,
-            "status": job.get_status(),
+            "status": job.get_status(refresh=False),  # queue.jobs 已带回状态
         })
     
     return jobs
@@ -366,9 +396,8 @@ def get_comic_started_jobs() -> List[Dict[str, Any]]:
     started_registry = StartedJobRegistry(queue=queue)
     
     jobs = []
-    for job_id in started_registry.get_job_ids():
+    for job in _fetch_jobs(started_registry.get_job_ids(), conn):
         try:
-            job = Job.fetch(job_id, connection=conn)
             jobs.append({
                 "job_id": job.id,
                 "paper_id": job.args[0] if job.args else None,
@@ -393,9 +422,8 @@ def get_comic_recent_finished_jobs(hours: int = 24) -> List[Dict[str, Any]]:
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
     
     jobs = []
-    for job_id in finished_registry.get_job_ids():
+    for job in _fetch_jobs(finished_registry.get_job_ids(), conn):
         try:
-            job = Job.fetch(job_id, connection=conn)
             if job.ended_at and job.ended_at >= cutoff:
                 jobs.append({
                     "job_id": job.id,
@@ -421,9 +449,8 @@ def get_comic_failed_jobs() -> List[Dict[str, Any]]:
     failed_registry = FailedJobRegistry(queue=queue)
     
     jobs = []
-    for job_id in failed_registry.get_job_ids():
+    for job in _fetch_jobs(failed_registry.get_job_ids(), conn):
         try:
-            job = Job.fetch(job_id, connection=conn)
             jobs.append({
                 "job_id": job.id,
                 "paper_id": job.args[0] if job.args else None,
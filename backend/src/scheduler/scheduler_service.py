@@ -99,7 +99,8 @@ class SchedulerService:
         """
         Register daily_arxiv job.
         """
-        trigger = CronTrigger.from_crontab(cron_expr)
+        # 显式指定时区：from_crontab 不会继承 scheduler 的 timezone，默认按主机本地时区触发
+        trigger = CronTrigger.from_crontab(cron_expr, timezone=Config.scheduler.timezone)
 
         self.scheduler.add_job(
             run_daily_arxiv_job,
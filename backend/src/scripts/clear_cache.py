@@ -29,6 +29,7 @@ def clear_project_runtime_cache():
     dirs_to_clear = [
         project_root / "backend" / "cache" / "imgs",
         project_root / "backend" / "cache" / "pdfs",
+        project_root / "backend" / "cache" / "markdown",
         project_root / "backend" / "logs",
     ]
     
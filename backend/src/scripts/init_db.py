@@ -9,13 +9,56 @@ Run ONCE when:
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.database.db.models import Base
+from sqlalchemy import text
+from sqlalchemy.schema import CreateColumn
+
+from src.database.db.models import Base, PaperRow
 from src.database.db.session import engine
 
 
+def create_extensions():
+    """
+    Postgres extensions required by the indexes (pg_trgm for search).
+    """
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
+def upgrade_papers_table():
+    """
+    Idempotent upgrade for an existing `papers` table.
+
+    create_all() 不会修改已存在的表，新增的列（含生成列）和索引需要单独补上。
+    """
+    table = PaperRow.__table__
+
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.primary_key:
+                continue
+            ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {ddl}")
+
+        # 旧的表达式索引已被 search_blob 列上的索引取代
+        conn.execute(text("DROP INDEX IF EXISTS ix_papers_search_trgm"))
+
+        # full_text 从 paper JSONB 迁移到单独的列
+        conn.execute(text(
+            "UPDATE papers "
+            "SET full_text = coalesce(full_text, paper->>'full_text'), "
+            "    paper = paper - 'full_text' "
+            "WHERE paper ? 'full_text'"
+        ))
+
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
 def main():
     print("🔧 Initializing database schema...")
+    create_extensions()
     Base.metadata.create_all(bind=engine)
+    upgrade_papers_table()
     print("✅ Database schema initialized.")
 
 
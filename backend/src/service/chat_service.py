@@ -18,16 +18,23 @@ from src.database.chat_repository import ChatRepository
 from src.model.chat import ChatSession, ChatMessage
 
 
+# 块级公式：\[...\] -> $$...$$
+_BLOCK_MATH_RE = re.compile(r'\\\[(.*?)\\\]', flags=re.DOTALL)
+# 行内公式：\(...\) -> $...$
+_INLINE_MATH_RE = re.compile(r'\\\((.*?)\\\)', flags=re.DOTALL)
+
+
 def _convert_latex_format(text: str) -> str:
     """
     将 LaTeX 格式转换为 Streamlit markdown 支持的格式
     \\[...\\] -> $$...$$
     \\(...\\) -> $...$
     """
-    # 块级公式：\[...\] -> $$...$$
-    text = re.sub(r'\\\[(.*?)\\\]', r'$$\1$$', text, flags=re.DOTALL)
-    # 行内公式：\(...\) -> $...$
-    text = re.sub(r'\\\((.*?)\\\)', r'$\1$', text, flags=re.DOTALL)
+    # 流式输出时每个分块都会调用一次，正则在模块加载时预编译
+    if "\\" not in text:
+        return text
+    text = _BLOCK_MATH_RE.sub(r'$$\1$$', text)
+    text = _INLINE_MATH_RE.sub(r'$\1$', text)
     return text
 
 
@@ -142,24 +149,31 @@ class ChatService:
         """删除会话"""
         return self.repo.delete_session(session_id)
     
-    def ask(self, session_id: str, question: str) -> Optional[str]:
+    def ask(
+        self,
+        session_id: str,
+        question: str,
+        session: Optional[ChatSession] = None,
+    ) -> Optional[str]:
         """
         发送问题并获取回复（非流式）
         
         Args:
             session_id: 会话 ID
             question: 用户问题
+            session: 调用方在本次渲染中已加载的会话（可选，传入则不再重复查询）
         
         Returns:
             AI 回复，如果会话不存在返回 None
         """
         # 获取会话
-        session = self.repo.get_session(session_id)
+        if session is None or session.id != session_id:
+            session = self.repo.get_session(session_id)
         if not session:
             return None
         
-        # 添加用户消息
-        self.repo.add_message(session_id, "user", question)
+        # 用户消息与 AI 回复在拿到回复后一起写入
+        user_msg = ChatMessage(session_id=session_id, role="user", content=question)
         
         # 构建消息列表
         messages = [
@@ -178,8 +192,11 @@ class ChatService:
         except Exception as e:
             answer = f"⚠️ Error: {str(e)}"
         
-        # 保存 AI 回复
-        self.repo.add_message(session_id, "assistant", answer)
+        # 保存本轮问答（单次往返）
+        self.repo.add_messages(session_id, [
+            user_msg,
+            ChatMessage(session_id=session_id, role="assistant", content=answer),
+        ])
         
         # 如果是第一个问题，自动生成标题
         if session.title is None:
@@ -187,13 +204,19 @@ class ChatService:
         
         return answer
 
-    def ask_stream(self, session_id: str, question: str) -> Generator[str, None, str]:
+    def ask_stream(
+        self,
+        session_id: str,
+        question: str,
+        session: Optional[ChatSession] = None,
+    ) -> Generator[str, None, str]:
         """
         发送问题并流式获取回复（SSE）
         
         Args:
             session_id: 会话 ID
             question: 用户问题
+            session: 调用方在本次渲染中已加载的会话（可选，传入则不再重复查询）
         
         Yields:
             逐块返回的回复内容
@@ -202,13 +225,14 @@ class ChatService:
             完整的 AI 回复
         """
         # 获取会话
-        session = self.repo.get_session(session_id)
+        if session is None or session.id != session_id:
+            session = self.repo.get_session(session_id)
         if not session:
             yield "❌ 会话不存在"
             return "❌ 会话不存在"
         
-        # 添加用户消息
-        self.repo.add_message(session_id, "user", question)
+        # 用户消息与 AI 回复在流结束后一起写入
+        user_msg = ChatMessage(session_id=session_id, role="user", content=question)
         
         # 构建消息列表
         messages = [
@@ -217,28 +241,37 @@ class ChatService:
         ]
         messages.append({"role": "user", "content": question})
         
-        # 流式调用 LLM
-        full_response = ""
+        # 流式调用 LLM（逐块收集，结束后一次性拼接）
+        parts: List[str] = []
+        full_response: Optional[str] = None
         try:
-            resp = completion(
-                model=Config.chat_litellm.model,
-                messages=messages,
-                stream=True,  # 启用流式
-            )
-            
-            for chunk in resp:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    yield content
-                    
-        except Exception as e:
-            error_msg = f"⚠️ Error: {str(e)}"
-            full_response = error_msg
-            yield error_msg
-        
-        # 保存完整的 AI 回复
-        self.repo.add_message(session_id, "assistant", full_response)
+            try:
+                resp = completion(
+                    model=Config.chat_litellm.model,
+                    messages=messages,
+                    stream=True,  # 启用流式
+                )
+                
+                for chunk in resp:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content = chunk.choices[0].delta.content
+                        parts.append(content)
+                        yield content
+                
+                full_response = "".join(parts)
+                        
+            except Exception as e:
+                error_msg = f"⚠️ Error: {str(e)}"
+                full_response = error_msg
+                yield error_msg
+        finally:
+            # 保存本轮问答（单次往返）；流被中途关闭时保存已收到的部分回复
+            if full_response is None:
+                full_response = "".join(parts)
+            self.repo.add_messages(session_id, [
+                user_msg,
+                ChatMessage(session_id=session_id, role="assistant", content=full_response),
+            ])
         
         # 如果是第一个问题，自动生成标题
         if session.title is None:
@@ -13,11 +13,12 @@ llm_paper_tools.py
 """
 
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Dict
 
 import litellm
-from litellm import completion
+from litellm import completion, acompletion
 from ..config import Config
 
 def init_litellm():
@@ -37,6 +38,15 @@ def llm_completion(prompt: str) -> str:
     return resp.choices[0].message.content
 
 
+async def llm_completion_async(prompt: str) -> str:
+    """单轮对话（异步版本，供 asyncio 任务并发调用）"""
+    resp = await acompletion(
+        model=Config.chat_litellm.model,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return resp.choices[0].message.content
+
+
 def llm_chat(messages: List[Dict]) -> str:
     """多轮对话"""
     resp = completion(
@@ -46,7 +56,21 @@ def llm_chat(messages: List[Dict]) -> str:
     return resp.choices[0].message.content
 
 
-def translate_title(title_text: str, target_lang: str = "zh") -> str:
+def llm_completion_many(prompts: List[str]) -> List[str]:
+    """
+    并发执行多个互相独立的单轮调用，结果与输入顺序一致
+
+    同时进行的请求数不超过 Config.chat_litellm.max_concurrency。
+    """
+    if len(prompts) <= 1:
+        return [llm_completion(p) for p in prompts]
+
+    workers = max(1, min(Config.chat_litellm.max_concurrency, len(prompts)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(llm_completion, prompts))
+
+
+def _translate_title_prompt(title_text: str, target_lang: str) -> str:
     prompt = f"""
 你是一名严谨的学术翻译助手，请将下面的学术标题翻译成 {target_lang}，要求：
 - 保持术语准确
@@ -55,14 +79,22 @@ def translate_title(title_text: str, target_lang: str = "zh") -> str:
 原文标题：
 {title_text}
 """
-    return llm_completion(prompt.strip())
+    return prompt.strip()
+
+
+def translate_title(title_text: str, target_lang: str = "zh") -> str:
+    return llm_completion(_translate_title_prompt(title_text, target_lang))
+
+
+async def translate_title_async(title_text: str, target_lang: str = "zh") -> str:
+    return await llm_completion_async(_translate_title_prompt(title_text, target_lang))
 
 
 # =========================================================
 # 🔹 2. 摘要翻译
 # =========================================================
 
-def translate_summary(summary_text: str, target_lang: str = "zh") -> str:
+def _translate_summary_prompt(summary_text: str, target_lang: str) -> str:
     prompt = f"""
 你是一名严谨的学术翻译助手，请将下面的学术摘要翻译成 {target_lang}，要求：
 - 保持术语准确
@@ -72,7 +104,15 @@ def translate_summary(summary_text: str, target_lang: str = "zh") -> str:
 原文摘要：
 {summary_text}
 """
-    return llm_completion(prompt.strip())
+    return prompt.strip()
+
+
+def translate_summary(summary_text: str, target_lang: str = "zh") -> str:
+    return llm_completion(_translate_summary_prompt(summary_text, target_lang))
+
+
+async def translate_summary_async(summary_text: str, target_lang: str = "zh") -> str:
+    return await llm_completion_async(_translate_summary_prompt(summary_text, target_lang))
 
 
 # =========================================================
@@ -132,8 +172,8 @@ Content:
 """
         return llm_completion(prompt.strip())
 
-    # === 多块总结 ===
-    partial_summaries = []
+    # === 多块总结（各块互相独立，并发调用） ===
+    prompts = []
 
     for i, chunk in enumerate(chunks, start=1):
         prompt = f"""
@@ -148,8 +188,9 @@ Requirements:
 Content:
 {chunk}
 """
-        summary = llm_completion(prompt.strip())
-        partial_summaries.append(summary)
+        prompts.append(prompt.strip())
+
+    partial_summaries = llm_completion_many(prompts)
 
     # === 合并 summaries ===
     joined = "\n\n---\n\n".join(partial_summaries)
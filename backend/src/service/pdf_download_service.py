@@ -1,8 +1,88 @@
 from __future__ import annotations
+import threading
 import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable
 import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import Config
+
+
+_http_session: requests.Session | None = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    进程内共享的 HTTP Session（单例），复用到 arxiv.org 的 keep-alive 连接
+
+    会被下载线程池并发调用，加锁保证只创建一个。
+    """
+    global _http_session
+
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                pool_size = Config.pdf_download.max_concurrency
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+
+    return _http_session
+
+
+# 后台下载（Streamlit 页面提交后立即返回，不阻塞渲染）
+_download_pool: ThreadPoolExecutor | None = None
+_in_flight: Dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def download_pdf_in_background(paper_id: str) -> Future:
+    """
+    在进程内线程池中下载 arXiv PDF，立即返回 Future
+
+    同一篇论文正在下载时直接返回已有的 Future，不重复提交。
+    """
+    global _download_pool
+
+    with _in_flight_lock:
+        future = _in_flight.get(paper_id)
+        if future is not None and not future.done():
+            return future
+
+        if _download_pool is None:
+            _download_pool = ThreadPoolExecutor(
+                max_workers=Config.pdf_download.max_concurrency,
+                thread_name_prefix="pdf-download",
+            )
+
+        future = _download_pool.submit(
+            PdfDownloader().download_one,
+            f"https://arxiv.org/pdf/{paper_id}.pdf",
+            paper_id,
+        )
+        _in_flight[paper_id] = future
+
+    future.add_done_callback(lambda f: _discard_in_flight(paper_id, f))
+    return future
+
+
+def is_pdf_downloading(paper_id: str) -> bool:
+    """该论文是否有正在进行的后台下载"""
+    with _in_flight_lock:
+        future = _in_flight.get(paper_id)
+    return future is not None and not future.done()
+
+
+def _discard_in_flight(paper_id: str, future: Future) -> None:
+    with _in_flight_lock:
+        if _in_flight.get(paper_id) is future:
+            del _in_flight[paper_id]
 
 
 class PdfDownloader:
@@ -13,7 +93,6 @@ class PdfDownloader:
         retries: int = 3,
         min_interval: int = 10,
     ):
-        from ..config import Config
         self.save_dir = Path(save_dir or Config.pdf_save_path)
         self.save_dir.mkdir(parents=True, exist_ok=True)
 
@@ -40,40 +119,41 @@ class PdfDownloader:
         if file.exists():
             print(f"⏭ Skip (exists): {file.name}")
         else:
-            tmp = file.with_suffix(file.suffix + ".part")
-            if tmp.exists():
-                tmp.unlink()
+            # 每次下载使用独立的临时文件：后台线程与 RQ 任务可能同时下载同一篇
+            tmp = file.with_name(f"{file.name}.{uuid.uuid4().hex}.part")
 
             for attempt in range(1, self.retries + 1):
                 try:
                     print(f"⬇ Start [{attempt}/{self.retries}]: {url}")
 
-                    r = requests.get(url, timeout=self.timeout, stream=True)
-                    r.raise_for_status()
+                    # with 保证响应读完/关闭后连接归还连接池
+                    with get_http_session().get(url, timeout=self.timeout, stream=True) as r:
+                        r.raise_for_status()
 
-                    content_type = r.headers.get("Content-Type", "")
+                        content_type = r.headers.get("Content-Type", "")
 
-                    # 先把内容读入内存头几 KB
-                    head = next(r.iter_content(chunk_size=1024 * 16))
-                    
-                    # 先判断是不是 PDF
-                    if not self._looks_like_pdf(head, content_type):
-                        print(f"🚫 Not a PDF (maybe CAPTCHA): {url}")
-                        return
+                        # 先把内容读入内存头几 KB
+                        head = next(r.iter_content(chunk_size=1024 * 16))
+                        
+                        # 先判断是不是 PDF
+                        if not self._looks_like_pdf(head, content_type):
+                            print(f"🚫 Not a PDF (maybe CAPTCHA): {url}")
+                            return
 
-                    # 写入 .part
-                    with tmp.open("wb") as f:
-                        f.write(head)
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
+                        # 写入 .part
+                        with tmp.open("wb") as f:
+                            f.write(head)
+                            for chunk in r.iter_content(chunk_size=8192):
+                                if chunk:
+                                    f.write(chunk)
 
-                    tmp.rename(file)
+                    tmp.replace(file)
                     print(f"✅ Saved PDF: {file.name}")
                     break
 
                 except Exception as e:
                     print(f"⚠ Error [{attempt}/{self.retries}]: {url} | {e}")
+                    tmp.unlink(missing_ok=True)
 
                     if attempt == self.retries:
                         print(f"❌ Failed: {url}")
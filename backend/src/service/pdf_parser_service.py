@@ -1,6 +1,12 @@
+import hashlib
 import re
+import uuid
+from pathlib import Path
+
 from pypdf import PdfReader
 
+from ..config import Config
+
 
 def sanitize_text_for_postgres(text: str) -> str:
     """
@@ -24,10 +30,40 @@ def sanitize_text_for_postgres(text: str) -> str:
     return text
 
 
-def extract_pdf_markdown(pdf_path: str) -> str:
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _extract_pdf_markdown_uncached(pdf_path: str | Path) -> str:
+    reader = PdfReader(pdf_path)
+    raw_text = "\n".join([page.extract_text() or "" for page in reader.pages])
+    return sanitize_text_for_postgres(raw_text)
+
+
+def extract_pdf_markdown(pdf_path: str | Path) -> str:
     """
     从 PDF 提取文本并清理不安全字符。
+
+    提取结果按 PDF 内容的 sha256 缓存在 Config.markdown_cache_path，
+    同一个 PDF 再次提取（重新生成总结等）时直接读取缓存。
     """
-    reader = PdfReader(pdf_path)
-    raw_text = "\n".join([page.extract_text() or "" for page in reader.pages])
-    return sanitize_text_for_postgres(raw_text)
\ No newline at end of file
+    pdf_path = Path(pdf_path)
+    cache_dir = Path(Config.markdown_cache_path)
+    cache_file = cache_dir / f"{_file_sha256(pdf_path)}.md"
+
+    if cache_file.exists():
+        return cache_file.read_text(encoding="utf-8")
+
+    text = _extract_pdf_markdown_uncached(pdf_path)
+
+    # 先写临时文件再替换，避免并发任务读到写了一半的缓存
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cache_dir / f"{cache_file.name}.{uuid.uuid4().hex}.part"
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(cache_file)
+
+    return text
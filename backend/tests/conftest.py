@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 测试按 backend/ 为根导入 src.*（与 app.py / worker.py 一致），从仓库根目录运行时同样可用
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
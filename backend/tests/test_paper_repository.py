@@ -0,0 +1,63 @@
+"""
+PaperRepository.count_estimate: planner row estimate via EXPLAIN (FORMAT JSON).
+"""
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+
+from src.database import paper_repository
+from src.database.db.models import PaperRow
+from src.database.paper_repository import PaperRepository, _Explain
+
+
+def _folder_filtered_statement():
+    query = PaperRepository()._apply_list_filters(Query(PaperRow.id), folder_filter="reading")
+    return query.statement
+
+
+def test_explain_renders_postgres_explain_statement():
+    sql = str(_Explain(_folder_filtered_statement()).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT papers.id")
+    assert "FROM papers" in sql
+    # 收藏夹筛选是 JSONB 包含判断，参数以 JSONB 绑定
+    assert "@>" in sql
+    assert "::JSONB" in sql
+
+
+class _StubResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+
+class _StubSession:
+    def __init__(self, plan):
+        self.plan = plan
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def query(self, *entities):
+        return Query(entities)
+
+    def execute(self, statement):
+        self.executed.append(statement)
+        return _StubResult(self.plan)
+
+
+def test_count_estimate_reads_plan_rows(monkeypatch):
+    session = _StubSession([{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}])
+    monkeypatch.setattr(paper_repository, "SessionLocal", lambda: session)
+
+    estimate = PaperRepository().count_estimate(folder_filter="reading")
+
+    assert estimate == 1234
+    assert len(session.executed) == 1
+    assert isinstance(session.executed[0], _Explain)